@@ -0,0 +1,34 @@
+export const runtime = "nodejs";
+export const dynamic = "force-dynamic";
+
+// The hardware daemon serves its preview next to /metrics (METRICS_PORT), e.g.
+// LED_PREVIEW_URL=http://127.0.0.1:9108/preview.
+const PREVIEW_URL = process.env.LED_PREVIEW_URL;
+
+export async function GET(request: Request) {
+  if (!PREVIEW_URL) {
+    return new Response(null, { status: 404 });
+  }
+
+  let upstream: Response;
+  try {
+    upstream = await fetch(PREVIEW_URL, { cache: "no-store", signal: request.signal });
+  } catch {
+    return new Response(null, { status: 503 });
+  }
+
+  if (!upstream.ok || !upstream.body) {
+    return new Response(null, { status: 503 });
+  }
+
+  // Pass the daemon's SSE bytes straight through; closing the browser stream aborts the
+  // upstream fetch, which drops the daemon's subscriber count back to zero.
+  return new Response(upstream.body, {
+    headers: {
+      "Content-Type": "text/event-stream; charset=utf-8",
+      "Cache-Control": "no-cache, no-transform",
+      Connection: "keep-alive",
+      "X-Accel-Buffering": "no",
+    },
+  });
+}
@@ -0,0 +1,102 @@
+import { Box } from "@mui/material";
+import React, { useEffect, useRef, useState } from "react";
+
+function decodeFrame(data: string) {
+  const binary = atob(data);
+  const bytes = new Uint8Array(binary.length);
+
+  for (let index = 0; index < binary.length; index += 1) {
+    bytes[index] = binary.charCodeAt(index);
+  }
+
+  return bytes;
+}
+
+const RETRY_INITIAL_MS = 2000;
+const RETRY_MAX_MS = 60000;
+
+export default function LedStripPreview() {
+  const canvasRef = useRef<HTMLCanvasElement>(null);
+  const [isLive, setIsLive] = useState(false);
+
+  useEffect(() => {
+    let eventSource: EventSource | null = null;
+    let retryTimeoutId: number | undefined;
+    let retryDelay = RETRY_INITIAL_MS;
+
+    const connect = () => {
+      const source = new EventSource("/api/preview/stream");
+      eventSource = source;
+
+      source.onmessage = (event) => {
+        const canvas = canvasRef.current;
+        const context = canvas?.getContext("2d");
+
+        if (!canvas || !context) {
+          return;
+        }
+
+        const rgb = decodeFrame(event.data);
+        const pixelCount = Math.floor(rgb.length / 3);
+
+        if (pixelCount === 0) {
+          return;
+        }
+
+        if (canvas.width !== pixelCount || canvas.height !== 1) {
+          canvas.width = pixelCount;
+          canvas.height = 1;
+        }
+
+        const image = context.createImageData(pixelCount, 1);
+
+        for (let pixel = 0; pixel < pixelCount; pixel += 1) {
+          image.data[pixel * 4] = rgb[pixel * 3];
+          image.data[pixel * 4 + 1] = rgb[pixel * 3 + 1];
+          image.data[pixel * 4 + 2] = rgb[pixel * 3 + 2];
+          image.data[pixel * 4 + 3] = 255;
+        }
+
+        context.putImageData(image, 0, 0);
+        retryDelay = RETRY_INITIAL_MS;
+        setIsLive(true);
+      };
+
+      source.onerror = () => {
+        // A 404/503 from the proxy closes the source for good, so retry with backoff
+        // until the daemon's preview comes back.
+        if (source.readyState !== EventSource.CLOSED) {
+          return;
+        }
+
+        setIsLive(false);
+        retryTimeoutId = window.setTimeout(connect, retryDelay);
+        retryDelay = Math.min(retryDelay * 2, RETRY_MAX_MS);
+      };
+    };
+
+    connect();
+
+    return () => {
+      window.clearTimeout(retryTimeoutId);
+      eventSource?.close();
+    };
+  }, []);
+
+  return (
+    <Box
+      component="canvas"
+      ref={canvasRef}
+      aria-label="Live LED strip preview"
+      sx={{
+        display: isLive ? "block" : "none",
+        width: "100%",
+        height: 14,
+        imageRendering: "pixelated",
+        bgcolor: "common.black",
+        border: "1px solid",
+        borderColor: "divider",
+      }}
+    />
+  );
+}
@@ -6,12 +6,24 @@ from typing import Callable, Iterable
 import requests
 
 from config import MESSAGE_API
+from instrumentation import INSTRUMENTS, SwitchTiming
+from tracing import TRACER
 
 
 class BackgroundSyncClient:
-    def __init__(self, on_background_id: Callable[[str], None], shutdown_event: threading.Event) -> None:
+    def __init__(
+        self,
+        on_background_id: Callable[[str, SwitchTiming], None],
+        shutdown_event: threading.Event,
+        display_active: threading.Event | None = None,
+    ) -> None:
         self._on_background_id = on_background_id
         self._shutdown = shutdown_event
+        self._display_active = display_active
+        self._wake = threading.Event()
+
+    def wake(self) -> None:
+        self._wake.set()
 
     def run_forever(self) -> None:
         session = requests.Session()
@@ -31,6 +43,7 @@ class BackgroundSyncClient:
                 periodic_refresh_thread = threading.Thread(
                     target=self._refresh_state_periodically,
                     args=(poll_session, periodic_refresh_shutdown),
+                    name="background-refresh",
                     daemon=True,
                 )
                 periodic_refresh_thread.start()
@@ -44,41 +57,71 @@ class BackgroundSyncClient:
                     ) as response:
                         response.raise_for_status()
 
-                        for raw_event in self._iter_sse_data(response):
-                            try:
-                                payload = json.loads(raw_event)
-                            except json.JSONDecodeError:
-                                continue
-
-                            background_id = self._extract_background_id(payload)
-                            if background_id:
-                                self._on_background_id(background_id)
+                        for raw_event, read_started_at in self._iter_sse_data(response):
+                            received_at = time.monotonic()
+                            INSTRUMENTS.increment("sse_events")
+                            with TRACER.span("sse_event", "sync"):
+                                try:
+                                    payload = json.loads(raw_event)
+                                except json.JSONDecodeError:
+                                    continue
+
+                                background_id = self._extract_background_id(payload)
+                                if background_id:
+                                    self._on_background_id(
+                                        background_id,
+                                        self._switch_timing("sse", payload, read_started_at, received_at),
+                                    )
 
                             if self._shutdown.is_set():
                                 break
 
                 except Exception as exc:
                     if not self._shutdown.is_set():
+                        TRACER.instant("sse_disconnect", "sync")
+                        INSTRUMENTS.increment("sse_reconnects")
                         print(f"Background stream disconnected, reconnecting: {exc}")
                         self._sleep_until_retry(MESSAGE_API.reconnect_delay_seconds)
                 finally:
                     periodic_refresh_shutdown.set()
+                    self._wake.set()
                     periodic_refresh_thread.join(timeout=1.0)
         finally:
             session.close()
             poll_session.close()
 
     def _fetch_background_state(self, session: requests.Session) -> None:
-        response = session.get(
-            MESSAGE_API.state_url,
-            timeout=(MESSAGE_API.connect_timeout_seconds, MESSAGE_API.read_timeout_seconds),
-            headers={"Cache-Control": "no-store"},
-        )
-        response.raise_for_status()
-
-        background_id = self._extract_background_id(response.json())
+        INSTRUMENTS.increment("poll_fetches")
+        requested_at = time.monotonic()
+        received_at = requested_at
+        with TRACER.span("poll_fetch", "sync"):
+            response = session.get(
+                MESSAGE_API.state_url,
+                timeout=(MESSAGE_API.connect_timeout_seconds, MESSAGE_API.read_timeout_seconds),
+                headers={"Cache-Control": "no-store"},
+            )
+            response.raise_for_status()
+            INSTRUMENTS.increment("poll_bytes", len(response.content))
+            received_at = time.monotonic()
+            payload = response.json()
+
+        background_id = self._extract_background_id(payload)
         if background_id:
-            self._on_background_id(background_id)
+            self._on_background_id(
+                background_id,
+                self._switch_timing("poll", payload, requested_at, received_at),
+            )
+
+    @staticmethod
+    def _switch_timing(source: str, payload: dict, read_started_at: float, received_at: float) -> SwitchTiming:
+        updated_at = payload.get("updatedAt")
+        return SwitchTiming(
+            source=source,
+            updated_at=updated_at if isinstance(updated_at, str) else "",
+            read_started_at=read_started_at,
+            received_at=received_at,
+            parsed_at=time.monotonic(),
+        )
 
     @staticmethod
     def _extract_background_id(payload: object) -> str | None:
@@ -89,8 +132,10 @@ class BackgroundSyncClient:
             return background_id
         return None
 
-    def _iter_sse_data(self, response: requests.Response) -> Iterable[str]:
+    def _iter_sse_data(self, response: requests.Response) -> Iterable[tuple[str, float]]:
+        # Yields each event's data with the monotonic time its first line arrived.
         data_lines: list[str] = []
+        started_at = 0.0
 
         for raw_line in response.iter_lines(chunk_size=1, decode_unicode=True):
             if self._shutdown.is_set():
@@ -102,7 +147,7 @@ class BackgroundSyncClient:
 
             if line == "":
                 if data_lines:
-                    yield "\n".join(data_lines)
+                    yield "\n".join(data_lines), started_at
                     data_lines.clear()
                 continue
 
@@ -110,10 +155,12 @@ class BackgroundSyncClient:
                 continue
 
             if line.startswith("data:"):
+                if not data_lines:
+                    started_at = time.monotonic()
                 data_lines.append(line[5:].lstrip())
 
         if data_lines:
-            yield "\n".join(data_lines)
+            yield "\n".join(data_lines), started_at
 
     def _refresh_state_periodically(
         self,
@@ -121,9 +168,13 @@ class BackgroundSyncClient:
         stop_event: threading.Event,
     ) -> None:
         while not self._shutdown.is_set():
-            if stop_event.wait(MESSAGE_API.state_refresh_seconds):
-                return
-            if self._shutdown.is_set():
+            # The stream still pushes changes while the display is dark, so the safety-net
+            # poll backs off until wake() asks for an immediate refresh.
+            idle = self._display_active is not None and not self._display_active.is_set()
+            interval = MESSAGE_API.idle_state_refresh_seconds if idle else MESSAGE_API.state_refresh_seconds
+            if self._wake.wait(interval):
+                self._wake.clear()
+            if stop_event.is_set() or self._shutdown.is_set():
                 return
 
             try:
@@ -133,8 +184,4 @@ class BackgroundSyncClient:
                     print(f"Background periodic state refresh failed: {exc}")
 
     def _sleep_until_retry(self, seconds: float) -> None:
-        deadline = time.monotonic() + seconds
-        while time.monotonic() < deadline:
-            if self._shutdown.is_set():
-                return
-            time.sleep(0.05)
+        self._shutdown.wait(seconds)
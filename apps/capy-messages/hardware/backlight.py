@@ -1,11 +1,14 @@
 from pathlib import Path
 
+from instrumentation import INSTRUMENTS
+
 
 class BacklightController:
     def __init__(self, brightness_file: Path, max_brightness: int) -> None:
         self._brightness_file = brightness_file
         self._max_brightness = max_brightness
         self._disabled = False
+        self._value: int | None = None
 
     @property
     def max_brightness(self) -> int:
@@ -16,8 +19,13 @@ class BacklightController:
             return
 
         clamped = max(0, min(self._max_brightness, int(value)))
+        if clamped == self._value:
+            return
+
         try:
+            INSTRUMENTS.increment("backlight_writes")
             self._brightness_file.write_text(f"{clamped}\n")
+            self._value = clamped
         except OSError as exc:
             # Some displays intermittently return EREMOTEIO (errno 121) via sysfs.
             # Disable further writes so the process stays alive.
@@ -1,5 +1,7 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, fields, replace
+from functools import lru_cache
 from pathlib import Path
+import json
 import os
 
 DEFAULT_BACKLIGHT_MAX_BRIGHTNESS = 255
@@ -71,6 +73,70 @@ class NeoPixelConfig:
     channel: int
     spi_device: str
     spi_khz: int
+    net_host: str
+    net_port: int
+    net_universe: int
+    net_skip_unchanged: bool
+
+
+@dataclass(frozen=True)
+class SegmentConfig:
+    name: str
+    output: NeoPixelConfig
+    background_id: str | None
+    offset: int
+
+
+@dataclass(frozen=True)
+class OutputStageConfig:
+    gamma: float
+    brightness: float
+    dither: bool
+
+
+@dataclass(frozen=True)
+class OutputWorkerConfig:
+    enabled: bool
+    slots: int
+    realtime_priority: int
+
+
+@dataclass(frozen=True)
+class FramePipelineConfig:
+    enabled: bool
+    depth: int
+
+
+@dataclass(frozen=True)
+class GovernorConfig:
+    enabled: bool
+    min_fps: float
+    max_quality: int
+    sample_seconds: float
+    hot_c: float
+    cool_c: float
+    load_high: float
+    load_low: float
+    thermal_path: Path
+
+
+@dataclass(frozen=True)
+class MetricsConfig:
+    host: str
+    port: int
+
+
+@dataclass(frozen=True)
+class PreviewConfig:
+    max_fps: float
+    max_pixels: int
+
+
+@dataclass(frozen=True)
+class TracingConfig:
+    enabled: bool
+    buffer_events: int
+    output_path: Path
 
 
 @dataclass(frozen=True)
@@ -82,6 +148,7 @@ class MessageApiConfig:
     read_timeout_seconds: float
     reconnect_delay_seconds: float
     state_refresh_seconds: float
+    idle_state_refresh_seconds: float
 
 
 @dataclass(frozen=True)
@@ -94,17 +161,15 @@ class TouchConfig:
 
 PIR_PIN = _int_env("PIR_PIN", 14)
 OFF_DELAY_SECONDS = _float_env("OFF_DELAY_SECONDS", 15.0)
+# Frame period, including each frame's render and push.
 ANIMATION_FRAME_DELAY_SECONDS = _float_env("ANIMATION_FRAME_DELAY_SECONDS", 0.02)
+PATTERN_TRANSITION_FRAMES = _int_env("PATTERN_TRANSITION_FRAMES", 25)
+# Evaluate smooth patterns at this many points and interpolate to the strip (0 = every pixel).
+# Patterns registered as sharp, which is every built-in one today, ignore it.
+PATTERN_CONTROL_POINTS = _int_env("PATTERN_CONTROL_POINTS", 0)
+INSTRUMENTATION_SAMPLES = _int_env("INSTRUMENTATION_SAMPLES", 256)
 
-_backlight_dir = _resolve_backlight_dir()
-_backlight_brightness = _backlight_dir / "brightness"
-_backlight_max = _backlight_dir / "max_brightness"
-
-BACKLIGHT = BacklightConfig(
-    dir=_backlight_dir,
-    brightness_file=_backlight_brightness,
-    max_brightness_file=_backlight_max,
-)
+STATE_CACHE_PATH = Path(os.getenv("STATE_CACHE_PATH", "/var/tmp/capy-messages-state.json"))
 
 NEOPIXEL = NeoPixelConfig(
     count=_int_env("NEOPIXEL_COUNT", 10),
@@ -117,6 +182,97 @@ NEOPIXEL = NeoPixelConfig(
     channel=_int_env("NEOPIXEL_CHANNEL", 0),
     spi_device=os.getenv("NEOPIXEL_SPI_DEVICE", "/dev/spidev0.0"),
     spi_khz=_int_env("NEOPIXEL_SPI_KHZ", 800),
+    net_host=os.getenv("NEOPIXEL_NET_HOST", "").strip(),
+    net_port=_int_env("NEOPIXEL_NET_PORT", 0),
+    net_universe=_int_env("NEOPIXEL_NET_UNIVERSE", 1),
+    net_skip_unchanged=_bool_env("NEOPIXEL_NET_SKIP_UNCHANGED", True),
+)
+
+
+def _segments_from_env(default_output: NeoPixelConfig) -> tuple[SegmentConfig, ...]:
+    raw = os.getenv("NEOPIXEL_SEGMENTS", "").strip()
+    if not raw:
+        return (SegmentConfig(name="main", output=default_output, background_id=None, offset=0),)
+
+    output_keys = {field.name for field in fields(NeoPixelConfig)}
+    segments: list[SegmentConfig] = []
+    next_shared_offset = 0
+    for index, item in enumerate(json.loads(raw)):
+        overrides = {key: value for key, value in item.items() if key in output_keys}
+        if "backend" in overrides:
+            overrides["backend"] = str(overrides["backend"]).strip().lower()
+        output = replace(default_output, **overrides)
+
+        # Segments without their own background are consecutive slices of one shared canvas.
+        background_id = item.get("background") or None
+        offset = int(item.get("offset", next_shared_offset if background_id is None else 0))
+        if background_id is None:
+            next_shared_offset = offset + output.count
+
+        segments.append(
+            SegmentConfig(
+                name=str(item.get("name", f"segment{index}")),
+                output=output,
+                background_id=background_id,
+                offset=offset,
+            )
+        )
+    return tuple(segments)
+
+
+SEGMENTS = _segments_from_env(NEOPIXEL)
+SEGMENT_RENDER_WORKERS = _int_env("NEOPIXEL_SEGMENT_RENDER_WORKERS", 0)
+
+OUTPUT_STAGE = OutputStageConfig(
+    # Pattern palettes are written as output levels (night's base sits at 4-13% value),
+    # so a 2.2 curve would correct them twice: night's mean peak channel drops from 22 to
+    # 2 and a quarter of its pixels go dark. With identity tables the stage is skipped;
+    # the dither takes effect once OUTPUT_BRIGHTNESS drops below 1.
+    gamma=_float_env("OUTPUT_GAMMA", 1.0),
+    brightness=_float_env("OUTPUT_BRIGHTNESS", 1.0),
+    dither=_bool_env("OUTPUT_DITHER", True),
+)
+
+OUTPUT_WORKER = OutputWorkerConfig(
+    enabled=_bool_env("OUTPUT_WORKER_ENABLED", False),
+    slots=_int_env("OUTPUT_WORKER_SLOTS", 4),
+    realtime_priority=_int_env("OUTPUT_WORKER_RT_PRIORITY", 0),
+)
+
+FRAME_PIPELINE = FramePipelineConfig(
+    enabled=_bool_env("FRAME_PIPELINE_ENABLED", False),
+    depth=_int_env("FRAME_PIPELINE_DEPTH", 3),
+)
+
+GOVERNOR = GovernorConfig(
+    enabled=_bool_env("GOVERNOR_ENABLED", True),
+    min_fps=_float_env("GOVERNOR_MIN_FPS", 12.0),
+    # Pattern quality levels the governor may step through before dropping fps (0 = never).
+    # Levels above 1 only lower resolution, which every built-in pattern opts out of.
+    max_quality=_int_env("GOVERNOR_MAX_QUALITY", 1),
+    sample_seconds=_float_env("GOVERNOR_SAMPLE_SECONDS", 2.0),
+    hot_c=_float_env("GOVERNOR_HOT_C", 75.0),
+    cool_c=_float_env("GOVERNOR_COOL_C", 68.0),
+    load_high=_float_env("GOVERNOR_LOAD_HIGH", 0.9),
+    load_low=_float_env("GOVERNOR_LOAD_LOW", 0.6),
+    thermal_path=Path(os.getenv("GOVERNOR_THERMAL_PATH", "/sys/class/thermal/thermal_zone0/temp")),
+)
+
+METRICS = MetricsConfig(
+    host=os.getenv("METRICS_HOST", "127.0.0.1").strip(),
+    port=_int_env("METRICS_PORT", 0),
+)
+
+# Live frame preview, served as SSE on the metrics server at /preview.
+PREVIEW = PreviewConfig(
+    max_fps=_float_env("PREVIEW_MAX_FPS", 10.0),
+    max_pixels=_int_env("PREVIEW_MAX_PIXELS", 150),
+)
+
+TRACING = TracingConfig(
+    enabled=_bool_env("TRACE_ENABLED", False),
+    buffer_events=_int_env("TRACE_BUFFER_EVENTS", 50000),
+    output_path=Path(os.getenv("TRACE_OUTPUT_PATH", "/tmp/capy-hardware-trace.json")),
 )
 
 _message_api_base = os.getenv("MESSAGE_API_BASE_URL", "http://127.0.0.1:3000").rstrip("/")
@@ -129,25 +285,40 @@ MESSAGE_API = MessageApiConfig(
     read_timeout_seconds=_float_env("HTTP_READ_TIMEOUT_SECONDS", 45.0),
     reconnect_delay_seconds=_float_env("HTTP_RECONNECT_DELAY_SECONDS", 1.5),
     state_refresh_seconds=_float_env("HTTP_STATE_REFRESH_SECONDS", 1.0),
+    idle_state_refresh_seconds=_float_env("HTTP_IDLE_STATE_REFRESH_SECONDS", 60.0),
 )
 
 TOUCH = TouchConfig(
     enabled=_bool_env("TOUCH_ENABLED", True),
     device_name_hint=os.getenv("TOUCH_DEVICE_NAME_HINT", "").strip(),
     debounce_seconds=_float_env("TOUCH_DEBOUNCE_SECONDS", 0.15),
+    # Devices are rescanned on /dev/input changes; this poll only runs without inotify
+    # while no touch device is attached.
     rescan_seconds=_float_env("TOUCH_RESCAN_SECONDS", 2.0),
 )
 
 
+@lru_cache(maxsize=1)
+def backlight_config() -> BacklightConfig:
+    # Resolved on first use rather than at import, so importing config never scans sysfs.
+    backlight_dir = _resolve_backlight_dir()
+    return BacklightConfig(
+        dir=backlight_dir,
+        brightness_file=backlight_dir / "brightness",
+        max_brightness_file=backlight_dir / "max_brightness",
+    )
+
+
 def read_backlight_max_brightness() -> int:
     override = os.getenv("BACKLIGHT_MAX_BRIGHTNESS")
     if override is not None:
         return int(override)
+    max_brightness_file = backlight_config().max_brightness_file
     try:
-        return int(BACKLIGHT.max_brightness_file.read_text().strip())
+        return int(max_brightness_file.read_text().strip())
     except (OSError, ValueError) as exc:
         print(
-            f"Backlight max_brightness read failed ({BACKLIGHT.max_brightness_file}): {exc}. "
+            f"Backlight max_brightness read failed ({max_brightness_file}): {exc}. "
             f"Using fallback={DEFAULT_BACKLIGHT_MAX_BRIGHTNESS}."
         )
         return DEFAULT_BACKLIGHT_MAX_BRIGHTNESS
@@ -0,0 +1,119 @@
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+from tracing import TRACER
+
+
+class FrameSlot:
+    __slots__ = ("buffer", "frame", "render_seconds", "output_seconds")
+
+    def __init__(self, frame_size: int) -> None:
+        self.buffer = bytearray(frame_size)
+        self.frame = 0
+        self.render_seconds = 0.0
+        self.output_seconds = 0.0
+
+
+class FramePipeline:
+    def __init__(
+        self,
+        render: Callable[[int], bytes],
+        process: Callable[[bytes, int], bytes],
+        frame_size: int,
+        depth: int = 3,
+    ) -> None:
+        self._render = render
+        self._process = process
+        self._condition = threading.Condition()
+        self._free = [FrameSlot(frame_size) for _ in range(max(1, depth))]
+        self._ready: deque[FrameSlot] = deque()
+        self._next_frame = 0
+        self._frame_step = 1
+        self._epoch = 0
+        self._paused = False
+        self._rendering = False
+        self._closed = False
+        self._error: Exception | None = None
+        self._thread = threading.Thread(target=self._run, name="frame-producer", daemon=True)
+        self._thread.start()
+
+    def take(self) -> FrameSlot | None:
+        with self._condition:
+            self._condition.wait_for(lambda: self._ready or self._closed or self._error is not None)
+            if self._closed:
+                return None
+            if self._error is not None:
+                raise RuntimeError("Frame producer stopped") from self._error
+            return self._ready.popleft()
+
+    def release(self, slot: FrameSlot) -> None:
+        with self._condition:
+            self._free.append(slot)
+            self._condition.notify_all()
+
+    def restart(self, next_frame: int, apply: Callable[[], None], frame_step: int | None = None) -> None:
+        # Waits out any render in flight, so apply() can retarget the renderer without
+        # racing the producer, then drops everything rendered ahead under the old state.
+        with self._condition:
+            self._paused = True
+            self._condition.wait_for(lambda: not self._rendering)
+            apply()
+            self._free.extend(self._ready)
+            self._ready.clear()
+            self._epoch += 1
+            self._next_frame = next_frame
+            if frame_step is not None:
+                self._frame_step = frame_step
+            self._paused = False
+            self._condition.notify_all()
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout=1.0)
+
+    def _run(self) -> None:
+        try:
+            while True:
+                with self._condition:
+                    self._condition.wait_for(lambda: self._closed or (self._free and not self._paused))
+                    if self._closed:
+                        return
+                    slot = self._free.pop()
+                    frame = self._next_frame
+                    self._next_frame += self._frame_step
+                    epoch = self._epoch
+                    self._rendering = True
+
+                started_at = time.perf_counter()
+                rendered = self._render(frame)
+                rendered_at = time.perf_counter()
+                processed = self._process(rendered, frame)
+                processed_at = time.perf_counter()
+                TRACER.complete("render", "frame", started_at, rendered_at)
+                TRACER.complete("output_stage", "frame", rendered_at, processed_at)
+
+                slot.buffer[:] = processed
+                slot.frame = frame
+                slot.render_seconds = rendered_at - started_at
+                slot.output_seconds = processed_at - rendered_at
+
+                with self._condition:
+                    self._rendering = False
+                    if epoch == self._epoch:
+                        self._ready.append(slot)
+                    else:
+                        self._free.append(slot)
+                    self._condition.notify_all()
+        except Exception as exc:
+            # A dead render worker would otherwise leave take() and restart() waiting forever.
+            print(f"Frame producer stopped: {exc!r}")
+            with self._condition:
+                self._error = exc
+        finally:
+            with self._condition:
+                self._rendering = False
+                self._condition.notify_all()
@@ -0,0 +1,77 @@
+import base64
+import threading
+import time
+from typing import Callable
+
+KEEPALIVE_SECONDS = 5.0
+
+
+class FramePreview:
+    def __init__(self, max_fps: float = 10.0, max_pixels: int = 150) -> None:
+        self._interval_seconds = 1.0 / max(0.1, max_fps)
+        self._max_pixels = max(1, max_pixels)
+        self._condition = threading.Condition()
+        self._frame = b""
+        self._sequence = 0
+        self._next_at = 0.0
+        self._closed = False
+        self.subscribers = 0
+
+    def offer(self, frame: bytes, force: bool = False) -> None:
+        # Called with every shown frame; with no subscribers this is one attribute check.
+        if not self.subscribers:
+            return
+        now = time.monotonic()
+        if now < self._next_at and not force:
+            return
+        self._next_at = now + self._interval_seconds
+        # Copied because pipelined and output-stage buffers are reused for the next frame.
+        with self._condition:
+            self._frame = bytes(frame)
+            self._sequence += 1
+            self._condition.notify_all()
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def stream(self, write: Callable[[bytes], None]) -> None:
+        with self._condition:
+            self.subscribers += 1
+            sequence = self._sequence
+            frame = self._frame
+        try:
+            if frame:
+                write(self._event(frame))
+            while True:
+                with self._condition:
+                    self._condition.wait_for(
+                        lambda: self._sequence != sequence or self._closed,
+                        timeout=KEEPALIVE_SECONDS,
+                    )
+                    if self._closed:
+                        return
+                    changed = self._sequence != sequence
+                    sequence = self._sequence
+                    frame = self._frame
+                # Downsampling and encoding happen on the subscriber's thread, not the frame loop.
+                write(self._event(frame) if changed else b": keepalive\n\n")
+        finally:
+            with self._condition:
+                self.subscribers -= 1
+
+    def _event(self, frame: bytes) -> bytes:
+        return b"data: " + base64.b64encode(_downsample_rgb(frame, self._max_pixels)) + b"\n\n"
+
+
+def _downsample_rgb(frame: bytes, max_pixels: int) -> bytes:
+    pixel_count = len(frame) // 3
+    if pixel_count <= max_pixels:
+        return frame
+
+    out = bytearray(max_pixels * 3)
+    for index in range(max_pixels):
+        source = index * pixel_count // max_pixels * 3
+        out[index * 3 : index * 3 + 3] = frame[source : source + 3]
+    return bytes(out)
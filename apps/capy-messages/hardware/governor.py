@@ -0,0 +1,174 @@
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Sequence
+
+
+@dataclass(frozen=True)
+class GovernorDecision:
+    fps: float
+    quality: int
+    reason: str
+    frame_ms: float
+    load: float
+    temperature_c: float | None
+
+
+class FrameRateGovernor:
+    def __init__(
+        self,
+        fps_levels: Sequence[float],
+        max_quality: int = 0,
+        sample_seconds: float = 2.0,
+        recover_samples: int = 3,
+        hot_c: float = 75.0,
+        cool_c: float = 68.0,
+        load_high: float = 0.90,
+        load_low: float = 0.60,
+        busy_high: float = 0.85,
+        busy_low: float = 0.50,
+        thermal_path: Path = Path("/sys/class/thermal/thermal_zone0/temp"),
+        enabled: bool = True,
+    ) -> None:
+        self._fps_levels = sorted(set(fps_levels), reverse=True)
+        self._max_quality = max(0, max_quality)
+        self._sample_seconds = sample_seconds
+        self._recover_samples = max(1, recover_samples)
+        self._hot_c = hot_c
+        self._cool_c = cool_c
+        self._load_high = load_high
+        self._load_low = load_low
+        self._busy_high = busy_high
+        self._busy_low = busy_low
+        self._thermal_path = thermal_path
+        self._enabled = enabled
+        self._cpu_count = os.cpu_count() or 1
+
+        self._fps_index = 0
+        self._quality = 0
+        self._calm_samples = 0
+        self._frame_seconds_total = 0.0
+        self._frame_count = 0
+        self._next_sample_at = time.monotonic() + sample_seconds
+        self._frame_delay_seconds = 1.0 / self._fps_levels[0]
+        self.decision = GovernorDecision(
+            fps=self._fps_levels[0],
+            quality=0,
+            reason="start",
+            frame_ms=0.0,
+            load=0.0,
+            temperature_c=None,
+        )
+
+    @property
+    def frame_delay_seconds(self) -> float:
+        return self._frame_delay_seconds
+
+    @property
+    def quality(self) -> int:
+        return self._quality
+
+    @property
+    def frame_step(self) -> int:
+        # Base frames each shown frame advances, so effects keep their speed at lower fps.
+        return max(1, round(self._fps_levels[0] / self._fps_levels[self._fps_index]))
+
+    def record_frame(self, work_seconds: float) -> GovernorDecision | None:
+        self._frame_seconds_total += work_seconds
+        self._frame_count += 1
+
+        now = time.monotonic()
+        if not self._enabled or now < self._next_sample_at:
+            return None
+        self._next_sample_at = now + self._sample_seconds
+        return self._evaluate()
+
+    def _evaluate(self) -> GovernorDecision | None:
+        frame_seconds = self._frame_seconds_total / max(1, self._frame_count)
+        self._frame_seconds_total = 0.0
+        self._frame_count = 0
+
+        load = os.getloadavg()[0] / self._cpu_count
+        temperature_c = self._read_temperature()
+        busy = frame_seconds / self._frame_delay_seconds
+
+        # Back off on a single hot sample, but only recover after several calm ones.
+        reason = ""
+        if temperature_c is not None and temperature_c >= self._hot_c:
+            reason = f"hot {temperature_c:.1f}C"
+        elif load >= self._load_high:
+            reason = f"load {load:.2f}"
+        elif busy >= self._busy_high:
+            reason = f"frame {frame_seconds * 1000:.1f}ms"
+
+        calm = (
+            (temperature_c is None or temperature_c <= self._cool_c)
+            and load <= self._load_low
+            and busy <= self._busy_low
+        )
+
+        changed = False
+        if reason:
+            self._calm_samples = 0
+            changed = self._step_down()
+        elif calm:
+            self._calm_samples += 1
+            if self._calm_samples >= self._recover_samples:
+                self._calm_samples = 0
+                changed = self._step_up()
+                reason = "recovered"
+        else:
+            self._calm_samples = 0
+
+        if not changed:
+            return None
+
+        fps = self._fps_levels[self._fps_index]
+        self._frame_delay_seconds = 1.0 / fps
+        self.decision = GovernorDecision(
+            fps=fps,
+            quality=self._quality,
+            reason=reason,
+            frame_ms=frame_seconds * 1000.0,
+            load=load,
+            temperature_c=temperature_c,
+        )
+        print(
+            f"Frame governor: {fps:.0f} fps, quality {self._quality} ({reason}; "
+            f"frame={frame_seconds * 1000:.1f}ms load={load:.2f} "
+            f"temp={'n/a' if temperature_c is None else f'{temperature_c:.1f}C'})"
+        )
+        return self.decision
+
+    def _step_down(self) -> bool:
+        if self._quality < self._max_quality:
+            self._quality += 1
+            return True
+        if self._fps_index < len(self._fps_levels) - 1:
+            self._fps_index += 1
+            return True
+        return False
+
+    def _step_up(self) -> bool:
+        if self._fps_index > 0:
+            self._fps_index -= 1
+            return True
+        if self._quality > 0:
+            self._quality -= 1
+            return True
+        return False
+
+    def _read_temperature(self) -> float | None:
+        try:
+            return int(self._thermal_path.read_text().strip()) / 1000.0
+        except (OSError, ValueError):
+            return None
+
+
+def fps_levels_for(frame_delay_seconds: float, min_fps: float) -> list[float]:
+    # Whole divisors of the base rate, so patterns that advance per frame can skip a
+    # whole number of frames and keep their speed.
+    max_fps = 1.0 / max(0.001, frame_delay_seconds)
+    levels = [max_fps / step for step in range(1, 5)]
+    return [level for level in levels if level >= min_fps] or [max_fps]
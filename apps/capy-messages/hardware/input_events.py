@@ -0,0 +1,110 @@
+import queue
+import threading
+import time
+from typing import Callable
+
+from backlight import BacklightController
+from instrumentation import INSTRUMENTS
+from state import RuntimeState
+from tracing import TRACER
+
+MOTION = "motion"
+NO_MOTION = "no_motion"
+TOUCH = "touch"
+_CLOSE = "close"
+
+
+class InputCoalescer:
+    def __init__(
+        self,
+        backlight: BacklightController,
+        state: RuntimeState,
+        off_delay_seconds: float,
+        on_wake: Callable[[], None] | None = None,
+    ) -> None:
+        self._backlight = backlight
+        self._state = state
+        self._off_delay_seconds = off_delay_seconds
+        self._on_wake = on_wake
+        # SimpleQueue.put never blocks, so gpiozero and evdev callbacks return immediately.
+        self._events: queue.SimpleQueue[str] = queue.SimpleQueue()
+        self._display_on = False
+        self._motion = False
+        self._off_at: float | None = None
+        self._thread: threading.Thread | None = None
+
+    def motion(self) -> None:
+        self._events.put(MOTION)
+
+    def no_motion(self) -> None:
+        self._events.put(NO_MOTION)
+
+    def touch(self) -> None:
+        self._events.put(TOUCH)
+
+    def start(self, display_on: bool, motion_active: bool) -> None:
+        self._display_on = display_on
+        self._motion = motion_active
+        if display_on and not motion_active:
+            self._off_at = time.monotonic() + self._off_delay_seconds
+        self._thread = threading.Thread(target=self.run_forever, name="input", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        self._events.put(_CLOSE)
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+
+    def run_forever(self) -> None:
+        while True:
+            timeout = None if self._off_at is None else max(0.0, self._off_at - time.monotonic())
+            try:
+                kinds = [self._events.get(timeout=timeout)]
+            except queue.Empty:
+                self._off_at = None
+                self._set_display(False)
+                continue
+
+            # Everything that queued up while the last transition was writing sysfs
+            # lands as one batch, so a burst of edges costs one transition at most.
+            while True:
+                try:
+                    kinds.append(self._events.get_nowait())
+                except queue.Empty:
+                    break
+            if _CLOSE in kinds:
+                return
+            self._apply(kinds)
+
+    def _apply(self, kinds: list[str]) -> None:
+        INSTRUMENTS.increment("input_events", len(kinds))
+        for kind in kinds:
+            if kind == MOTION:
+                self._motion = True
+            elif kind == NO_MOTION:
+                self._motion = False
+
+        woke = MOTION in kinds or TOUCH in kinds
+        if woke:
+            self._set_display(True)
+
+        if self._motion:
+            self._off_at = None
+        elif woke or NO_MOTION in kinds:
+            self._off_at = time.monotonic() + self._off_delay_seconds
+
+    def _set_display(self, active: bool) -> None:
+        if active == self._display_on:
+            return
+
+        self._display_on = active
+        INSTRUMENTS.increment("display_transitions")
+        TRACER.instant("display on" if active else "display off", "input")
+        if active:
+            self._backlight.turn_on()
+            self._state.set_display_active(True)
+            if self._on_wake is not None:
+                self._on_wake()
+        else:
+            self._backlight.turn_off()
+            self._state.set_display_active(False)
@@ -0,0 +1,220 @@
+import signal
+import sys
+import time
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TextIO
+
+from config import INSTRUMENTATION_SAMPLES
+
+# Upper bucket bounds in milliseconds; one extra bucket catches everything slower.
+BUCKET_BOUNDS_MS = (0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 64.0, 128.0)
+SYNC_BUCKET_BOUNDS_MS = (5.0, 10.0, 20.0, 50.0, 100.0, 200.0, 500.0, 1000.0, 2000.0, 5000.0)
+
+STAGES = ("pattern", "smooth", "render", "output_stage", "show", "push", "frame")
+SYNC_STAGES = ("sync_apply", "switch_read", "switch_parse", "switch_pickup", "switch_show")
+COUNTERS = (
+    "frames_rendered",
+    "frames_late",
+    "frames_dropped",
+    "driver_errors",
+    "driver_reopens",
+    "sse_events",
+    "sse_reconnects",
+    "poll_fetches",
+    "poll_bytes",
+    "backlight_writes",
+    "input_events",
+    "display_transitions",
+)
+
+# timestamp, frame index, render, output stage, show, total frame work (seconds)
+_SAMPLE_FIELDS = 6
+
+
+@dataclass(frozen=True)
+class SwitchTiming:
+    # Monotonic timestamps for one background change, filled in as it moves from the
+    # server response to the first frame that shows it.
+    source: str
+    updated_at: str
+    read_started_at: float
+    received_at: float
+    parsed_at: float
+    published_at: float = 0.0
+    selected_at: float = 0.0
+    shown_at: float = 0.0
+
+
+class LatencyHistogram:
+    def __init__(self, bounds_ms: tuple[float, ...] = BUCKET_BOUNDS_MS) -> None:
+        self.bounds_ms = bounds_ms
+        self._bounds = [bound / 1000.0 for bound in bounds_ms]
+        self.buckets = array("Q", bytes(8 * (len(bounds_ms) + 1)))
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.buckets[bisect_left(self._bounds, seconds)] += 1
+        self.count += 1
+        self.total_seconds += seconds
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+
+    def quantile_ms(self, quantile: float) -> float:
+        # Bucketed, so this reports the upper bound of the bucket holding the quantile.
+        if self.count == 0:
+            return 0.0
+        rank = quantile * self.count
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= rank:
+                if index < len(self.bounds_ms):
+                    return self.bounds_ms[index]
+                break
+        return self.max_seconds * 1000.0
+
+
+class FrameSampleRing:
+    def __init__(self, size: int) -> None:
+        self._size = max(1, size)
+        self._values = array("d", bytes(8 * self._size * _SAMPLE_FIELDS))
+        self._next = 0
+
+    def record(
+        self,
+        frame: int,
+        render_seconds: float,
+        output_stage_seconds: float,
+        show_seconds: float,
+        total_seconds: float,
+    ) -> None:
+        base = (self._next % self._size) * _SAMPLE_FIELDS
+        values = self._values
+        values[base] = time.monotonic()
+        values[base + 1] = frame
+        values[base + 2] = render_seconds
+        values[base + 3] = output_stage_seconds
+        values[base + 4] = show_seconds
+        values[base + 5] = total_seconds
+        self._next += 1
+
+    def recent(self) -> list[tuple[float, ...]]:
+        count = min(self._next, self._size)
+        first = self._next - count
+        samples = []
+        for position in range(first, self._next):
+            base = (position % self._size) * _SAMPLE_FIELDS
+            samples.append(tuple(self._values[base : base + _SAMPLE_FIELDS]))
+        return samples
+
+
+class Instrumentation:
+    def __init__(self, samples: int = INSTRUMENTATION_SAMPLES) -> None:
+        self.histograms = {stage: LatencyHistogram() for stage in STAGES}
+        for stage in SYNC_STAGES:
+            self.histograms[stage] = LatencyHistogram(SYNC_BUCKET_BOUNDS_MS)
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.samples = FrameSampleRing(samples)
+        self.last_switch: SwitchTiming | None = None
+
+    def observe(self, stage: str, seconds: float) -> None:
+        self.histograms[stage].observe(seconds)
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def record_frame(
+        self,
+        frame: int,
+        render_seconds: float,
+        output_stage_seconds: float,
+        show_seconds: float,
+        total_seconds: float,
+        deadline_seconds: float,
+    ) -> None:
+        self.histograms["render"].observe(render_seconds)
+        self.histograms["output_stage"].observe(output_stage_seconds)
+        self.histograms["show"].observe(show_seconds)
+        self.histograms["frame"].observe(total_seconds)
+        self.counters["frames_rendered"] += 1
+        if total_seconds > deadline_seconds > 0:
+            self.counters["frames_late"] += 1
+            # Each whole extra period of overrun is a frame slot that never reached the strip.
+            self.counters["frames_dropped"] += int(total_seconds / deadline_seconds) - 1
+        self.samples.record(frame, render_seconds, output_stage_seconds, show_seconds, total_seconds)
+
+    def record_switch(self, timing: SwitchTiming, background_id: str) -> None:
+        self.last_switch = timing
+        stages = (
+            ("switch_read", timing.read_started_at, timing.received_at),
+            ("switch_parse", timing.received_at, timing.parsed_at),
+            ("switch_pickup", timing.parsed_at, timing.selected_at),
+            ("switch_show", timing.selected_at, timing.shown_at),
+            ("sync_apply", timing.read_started_at, timing.shown_at),
+        )
+        for stage, started_at, ended_at in stages:
+            self.histograms[stage].observe(max(0.0, ended_at - started_at))
+
+        lag = _server_lag_seconds(timing.updated_at)
+        print(
+            f"Background switch to '{background_id}' via {timing.source}: "
+            + " ".join(
+                f"{stage.removeprefix('switch_')}={(ended_at - started_at) * 1000:.1f}ms"
+                for stage, started_at, ended_at in stages
+            )
+            + (f" (updatedAt {timing.updated_at}, {lag:.0f}s before shown)" if lag is not None else "")
+        )
+
+    def achieved_fps(self, window_seconds: float = 5.0) -> float:
+        since = time.monotonic() - window_seconds
+        timestamps = [sample[0] for sample in self.samples.recent() if sample[0] >= since]
+        if len(timestamps) < 2 or timestamps[-1] <= timestamps[0]:
+            return 0.0
+        return (len(timestamps) - 1) / (timestamps[-1] - timestamps[0])
+
+    def dump(self, stream: TextIO = sys.stdout) -> None:
+        lines = ["Frame pipeline instrumentation:"]
+        for stage, histogram in self.histograms.items():
+            if histogram.count == 0:
+                continue
+            mean_ms = histogram.total_seconds / histogram.count * 1000.0
+            lines.append(
+                f"  {stage:<12} n={histogram.count} mean={mean_ms:.2f}ms "
+                f"p50<={histogram.quantile_ms(0.5):g}ms p99<={histogram.quantile_ms(0.99):g}ms "
+                f"max={histogram.max_seconds * 1000.0:.2f}ms"
+            )
+        lines.append("  counters: " + " ".join(f"{name}={value}" for name, value in self.counters.items()))
+
+        lines.append("  recent frames (age_s frame render_ms output_ms show_ms total_ms):")
+        now = time.monotonic()
+        for timestamp, frame, render, output, show, total in self.samples.recent():
+            lines.append(
+                f"    {now - timestamp:7.2f} {int(frame):>8} {render * 1000:7.2f} "
+                f"{output * 1000:7.2f} {show * 1000:7.2f} {total * 1000:7.2f}"
+            )
+        print("\n".join(lines), file=stream, flush=True)
+
+
+def _server_lag_seconds(updated_at: str) -> float | None:
+    # updatedAt is Pacific wall time to the second with no offset, so this is only a
+    # coarse cross-check that the event wasn't stale, not a latency measurement.
+    try:
+        from zoneinfo import ZoneInfo
+
+        pacific = ZoneInfo("America/Los_Angeles")
+        server_time = datetime.fromisoformat(updated_at).replace(tzinfo=pacific)
+    except (ImportError, ValueError, KeyError):
+        return None
+    return (datetime.now(pacific) - server_time).total_seconds()
+
+
+INSTRUMENTS = Instrumentation()
+
+
+def install_dump_signal(instruments: Instrumentation = INSTRUMENTS) -> None:
+    signal.signal(signal.SIGUSR1, lambda signum, frame: instruments.dump())
@@ -1,119 +1,320 @@
 #!/usr/bin/env python3
+from dataclasses import replace
 from signal import pause
 import threading
 import time
 
-from gpiozero import Device, MotionSensor
-from gpiozero.pins.lgpio import LGPIOFactory
-
-from background_sync import BackgroundSyncClient
-from backgrounds import DEFAULT_BACKGROUND_ID, pattern_for_background
+from backgrounds import DEFAULT_BACKGROUND_ID
 from backlight import BacklightController
 from config import (
     ANIMATION_FRAME_DELAY_SECONDS,
-    BACKLIGHT,
-    NEOPIXEL,
+    FRAME_PIPELINE,
+    GOVERNOR,
+    METRICS,
     OFF_DELAY_SECONDS,
+    OUTPUT_STAGE,
+    OUTPUT_WORKER,
+    PATTERN_CONTROL_POINTS,
+    PATTERN_TRANSITION_FRAMES,
     PIR_PIN,
+    PREVIEW,
+    SEGMENT_RENDER_WORKERS,
+    SEGMENTS,
+    STATE_CACHE_PATH,
+    backlight_config,
     read_backlight_max_brightness,
 )
-from neopixel_driver import build_pixel_driver
-from patterns import PatternRenderer
-from state import RuntimeState
-from touch_input import TouchWatcher
+from frame_preview import FramePreview
+from governor import FrameRateGovernor, fps_levels_for
+from input_events import InputCoalescer
+from instrumentation import INSTRUMENTS, SwitchTiming, install_dump_signal
+from neopixel_driver import PixelDriver, build_output_driver
+from output_stage import OutputStage
+from patterns import MAX_QUALITY, build_segment_renderer
+from state import RuntimeSnapshot, RuntimeState
+from state_cache import CachedState, load_cached_state, save_cached_state
+from tracing import TRACER, install_trace_signal
+
 
-Device.pin_factory = LGPIOFactory()
+def show_first_frame(pixels: PixelDriver, patterns, output_stage: OutputStage, background_id: str) -> None:
+    patterns.select(background_id)
+    pixels.show(output_stage.process(patterns.render(0), 0))
 
 
 def main() -> None:
-    pir = MotionSensor(PIR_PIN)
-    state = RuntimeState(initial_background_id=DEFAULT_BACKGROUND_ID)
+    # Everything up to the first frame avoids the GPIO and HTTP stacks, so a restarted
+    # daemon puts the cached pattern back on the strip before those finish importing.
+    cached = load_cached_state(STATE_CACHE_PATH)
+    state = RuntimeState(initial_background_id=cached.background_id if cached else DEFAULT_BACKGROUND_ID)
 
     backlight = BacklightController(
-        brightness_file=BACKLIGHT.brightness_file,
+        brightness_file=backlight_config().brightness_file,
         max_brightness=read_backlight_max_brightness(),
     )
-    pixels = build_pixel_driver()
-    patterns = PatternRenderer(pixel_count=NEOPIXEL.count)
+    fps_levels = fps_levels_for(ANIMATION_FRAME_DELAY_SECONDS, GOVERNOR.min_fps)
+    frame_size = sum(segment.output.count for segment in SEGMENTS) * 3
+    output_worker = None
+    if OUTPUT_WORKER.enabled:
+        from output_worker import ProcessPixelDriver
+
+        output_worker = ProcessPixelDriver(
+            build_driver=lambda: build_output_driver(SEGMENTS),
+            frame_size=frame_size,
+            slots=OUTPUT_WORKER.slots,
+            frame_period_seconds=ANIMATION_FRAME_DELAY_SECONDS,
+            realtime_priority=OUTPUT_WORKER.realtime_priority,
+        )
+        pixels = output_worker
+    else:
+        pixels = build_output_driver(SEGMENTS)
+    patterns = build_segment_renderer(
+        SEGMENTS,
+        transition_frames=PATTERN_TRANSITION_FRAMES,
+        workers=SEGMENT_RENDER_WORKERS,
+        control_points=PATTERN_CONTROL_POINTS,
+    )
+    output_stage = OutputStage(
+        gamma=OUTPUT_STAGE.gamma,
+        brightness=OUTPUT_STAGE.brightness,
+        dither=OUTPUT_STAGE.dither,
+    )
+
+    pixels.begin()
+    resume_display = cached is not None and cached.display_active
+    if resume_display:
+        backlight.turn_on()
+        state.set_display_active(True)
+        show_first_frame(pixels, patterns, output_stage, state.snapshot.background_id)
+    else:
+        pixels.clear()
+        backlight.turn_off()
+        state.set_display_active(False)
+
+    from gpiozero import Device, MotionSensor
+    from gpiozero.pins.lgpio import LGPIOFactory
+
+    from background_sync import BackgroundSyncClient
+    from touch_input import TouchWatcher
+
+    Device.pin_factory = LGPIOFactory()
+    pir = MotionSensor(PIR_PIN)
+
+    governor = FrameRateGovernor(
+        fps_levels=fps_levels,
+        max_quality=min(GOVERNOR.max_quality, MAX_QUALITY),
+        sample_seconds=GOVERNOR.sample_seconds,
+        hot_c=GOVERNOR.hot_c,
+        cool_c=GOVERNOR.cool_c,
+        load_high=GOVERNOR.load_high,
+        load_low=GOVERNOR.load_low,
+        thermal_path=GOVERNOR.thermal_path,
+        enabled=GOVERNOR.enabled,
+    )
+
+    saved_state = cached
+    saved_state_lock = threading.Lock()
+
+    def persist_state() -> None:
+        # Runs on the sync thread and at shutdown; the frame loop never touches the disk.
+        nonlocal saved_state
+        snapshot = state.snapshot
+        current = CachedState(background_id=snapshot.background_id, display_active=snapshot.display_active)
+        with saved_state_lock:
+            if current != saved_state:
+                save_cached_state(STATE_CACHE_PATH, current)
+                saved_state = current
+
+    def apply_background_id(background_id: str, timing: SwitchTiming) -> None:
+        changed = background_id != state.snapshot.background_id
+        state.set_background_id(background_id, timing)
+        if changed:
+            persist_state()
 
     background_sync = BackgroundSyncClient(
-        on_background_id=state.set_background_id,
+        on_background_id=apply_background_id,
         shutdown_event=state.shutdown,
+        display_active=state.display_active,
     )
 
-    off_timer: threading.Timer | None = None
-    off_timer_lock = threading.Lock()
+    preview = FramePreview(max_fps=PREVIEW.max_fps, max_pixels=PREVIEW.max_pixels)
 
-    def cancel_off_timer() -> None:
-        nonlocal off_timer
-        with off_timer_lock:
-            if off_timer and off_timer.is_alive():
-                off_timer.cancel()
-            off_timer = None
-
-    def timeout_display_off() -> None:
-        backlight.turn_off()
-        state.display_active.clear()
+    inputs = InputCoalescer(
+        backlight=backlight,
+        state=state,
+        off_delay_seconds=OFF_DELAY_SECONDS,
+        on_wake=background_sync.wake,
+    )
 
-    def schedule_backlight_off() -> None:
-        nonlocal off_timer
-        with off_timer_lock:
-            if off_timer and off_timer.is_alive():
-                off_timer.cancel()
-            off_timer = threading.Timer(OFF_DELAY_SECONDS, timeout_display_off)
-            off_timer.daemon = True
-            off_timer.start()
+    def apply_snapshot(snapshot: RuntimeSnapshot) -> None:
+        patterns.select(snapshot.background_id)
 
     def animation_loop() -> None:
-        frame = 0
+        frame = 1 if resume_display else 0
         pixels_off = False
+        state_version = -1
+        applied_background_id: str | None = None
+        switch_timing: SwitchTiming | None = None
+        quality = 0
+        frame_step = 1
+        next_frame_at: float | None = None
 
         while not state.shutdown.is_set():
-            if state.display_active.is_set():
-                pattern = pattern_for_background(state.get_background_id())
-                colors = patterns.render(pattern, frame)
+            snapshot = state.snapshot
+            if snapshot.version != state_version:
+                state_version = snapshot.version
+                if pipeline is None:
+                    apply_snapshot(snapshot)
+                else:
+                    pipeline.restart(frame, lambda: apply_snapshot(snapshot))
+                if snapshot.background_id != applied_background_id:
+                    TRACER.instant(f"select {snapshot.background_id}", "frame")
+                    applied_background_id = snapshot.background_id
+                    switch_timing = None
+                    if snapshot.background_timing is not None and snapshot.display_active:
+                        switch_timing = replace(snapshot.background_timing, selected_at=time.monotonic())
+
+            if snapshot.display_active and not pixels.available:
+                # Output is reinitializing; hold the frame counter so the pattern
+                # picks up where it stopped once the driver is back.
+                next_frame_at = None
+                time.sleep(0.1)
+                continue
+
+            if snapshot.display_active:
+                started_at = time.perf_counter()
+                if next_frame_at is None:
+                    next_frame_at = started_at
+                slot = None
+                if pipeline is None:
+                    rendered = patterns.render(frame)
+                    rendered_at = time.perf_counter()
+                    frame_bytes = output_stage.process(rendered, frame)
+                    processed_at = time.perf_counter()
+                    render_seconds = rendered_at - started_at
+                    output_seconds = processed_at - rendered_at
+                    TRACER.complete("render", "frame", started_at, rendered_at)
+                    TRACER.complete("output_stage", "frame", rendered_at, processed_at)
+                else:
+                    # The producer thread has usually rendered this frame already.
+                    slot = pipeline.take()
+                    if slot is None:
+                        break
+                    frame = slot.frame
+                    frame_bytes = slot.buffer
+                    render_seconds = slot.render_seconds
+                    output_seconds = slot.output_seconds
+                    processed_at = time.perf_counter()
 
-                pixels.show(colors)
-                frame += 1
+                pixels.show(frame_bytes)
+                shown_at = time.perf_counter()
+                preview.offer(frame_bytes)
+                if slot is not None:
+                    pipeline.release(slot)
+
+                # Pipelined frames overlap render and push, so the slower of the two is the load.
+                if slot is None:
+                    work_seconds = shown_at - started_at
+                else:
+                    work_seconds = max(render_seconds + output_seconds, shown_at - processed_at)
+                TRACER.complete("show", "frame", processed_at, shown_at)
+                INSTRUMENTS.record_frame(
+                    frame,
+                    render_seconds=render_seconds,
+                    output_stage_seconds=output_seconds,
+                    show_seconds=shown_at - processed_at,
+                    total_seconds=work_seconds,
+                    deadline_seconds=governor.frame_delay_seconds,
+                )
+                if switch_timing is not None:
+                    INSTRUMENTS.record_switch(replace(switch_timing, shown_at=time.monotonic()), applied_background_id)
+                    switch_timing = None
+                frame += frame_step
                 pixels_off = False
-                time.sleep(ANIMATION_FRAME_DELAY_SECONDS)
+                decision = governor.record_frame(work_seconds)
+                if decision is not None and (decision.quality != quality or governor.frame_step != frame_step):
+                    quality = decision.quality
+                    frame_step = governor.frame_step
+                    if pipeline is None:
+                        patterns.set_quality(quality)
+                    else:
+                        pipeline.restart(frame, lambda: patterns.set_quality(quality), frame_step)
+
+                # The period includes the frame's own work; a late frame starts the next
+                # one at once instead of bursting to catch up.
+                next_frame_at += governor.frame_delay_seconds
+                remaining = next_frame_at - time.perf_counter()
+                if remaining > 0:
+                    time.sleep(remaining)
+                else:
+                    next_frame_at = time.perf_counter()
                 continue
 
             if not pixels_off:
                 pixels.clear()
+                preview.offer(bytes(frame_size), force=True)
                 pixels_off = True
 
-            time.sleep(0.05)
+            next_frame_at = None
+            with TRACER.span("idle", "frame"):
+                keepalive_seconds = pixels.keepalive_seconds
+                while not state.wait_until_active(timeout=keepalive_seconds):
+                    if state.shutdown.is_set():
+                        break
+                    # Network receivers run their own effect once frames stop arriving.
+                    pixels.clear()
 
-    def wake_display() -> None:
-        backlight.turn_on()
-        state.display_active.set()
-
-    def on_motion() -> None:
-        cancel_off_timer()
-        wake_display()
+    def metrics_gauges() -> dict[str, float]:
+        snapshot = state.snapshot
+        gauges: dict[str, float] = {
+            "target_fps": governor.decision.fps,
+            "achieved_fps": INSTRUMENTS.achieved_fps(),
+            "quality_level": governor.decision.quality,
+            "display_active": float(snapshot.display_active),
+            "output_available": float(pixels.available),
+            "state_version": snapshot.version,
+        }
+        if output_worker is not None:
+            stats = output_worker.stats()
+            gauges["output_worker_frames_dropped"] = stats.frames_dropped
+            gauges["output_worker_underruns"] = stats.underruns
+            gauges["output_worker_errors"] = stats.errors
+            gauges["output_worker_latency_max_seconds"] = stats.latency_max_ms / 1000.0
+        return gauges
 
-    def on_no_motion() -> None:
-        schedule_backlight_off()
+    install_dump_signal()
+    install_trace_signal()
+    metrics_server = None
+    if METRICS.port > 0:
+        from metrics_server import MetricsServer, render_prometheus
 
-    def on_touch() -> None:
-        wake_display()
+        metrics_server = MetricsServer(
+            METRICS.host,
+            METRICS.port,
+            lambda: render_prometheus(INSTRUMENTS, metrics_gauges()),
+            preview=preview,
+        )
+        metrics_server.start()
+        print(f"Metrics endpoint listening on http://{METRICS.host}:{metrics_server.port}/metrics")
+        print(f"Frame preview stream on http://{METRICS.host}:{metrics_server.port}/preview")
 
-        if pir.is_active:
-            cancel_off_timer()
-            return
+    # Started after the first frame so the producer never races show_first_frame().
+    pipeline = None
+    if FRAME_PIPELINE.enabled:
+        from frame_pipeline import FramePipeline
 
-        schedule_backlight_off()
-
-    pixels.begin()
-    pixels.clear()
-    backlight.turn_off()
-    state.display_active.clear()
+        pipeline = FramePipeline(
+            render=patterns.render,
+            process=output_stage.process,
+            frame_size=frame_size,
+            depth=FRAME_PIPELINE.depth,
+        )
 
-    animation_thread = threading.Thread(target=animation_loop, daemon=True)
-    background_thread = threading.Thread(target=background_sync.run_forever, daemon=True)
+    animation_thread = threading.Thread(target=animation_loop, name="animation", daemon=True)
+    background_thread = threading.Thread(target=background_sync.run_forever, name="background-sync", daemon=True)
+    touch_watcher = TouchWatcher(on_touch=inputs.touch, shutdown_event=state.shutdown)
     touch_thread = threading.Thread(
-        target=TouchWatcher(on_touch=on_touch, shutdown_event=state.shutdown).run_forever,
+        target=touch_watcher.run_forever,
+        name="touch",
         daemon=True,
     )
 
@@ -121,21 +322,35 @@ def main() -> None:
     background_thread.start()
     touch_thread.start()
 
-    pir.when_motion = on_motion
-    pir.when_no_motion = on_no_motion
+    inputs.start(display_on=resume_display, motion_active=pir.is_active)
+    pir.when_motion = inputs.motion
+    pir.when_no_motion = inputs.no_motion
 
     try:
         pause()
     finally:
-        state.shutdown.set()
-        state.display_active.clear()
-        cancel_off_timer()
+        # Saved before the display is forced off below, so a restart resumes as it was.
+        persist_state()
+        state.request_shutdown()
+        touch_watcher.close()
+        inputs.close()
+        state.set_display_active(False)
 
+        if pipeline is not None:
+            pipeline.close()
         animation_thread.join(timeout=1.0)
         background_thread.join(timeout=1.0)
         touch_thread.join(timeout=1.0)
 
+        if metrics_server is not None:
+            preview.close()
+            metrics_server.close()
+        if TRACER.enabled:
+            TRACER.dump()
         pixels.clear()
+        patterns.close()
+        if output_worker is not None:
+            output_worker.close()
         backlight.turn_off()
 
 
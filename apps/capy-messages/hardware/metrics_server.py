@@ -0,0 +1,102 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Mapping
+
+from frame_preview import FramePreview
+from instrumentation import Instrumentation
+
+_PREFIX = "capy"
+
+
+class MetricsServer:
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        collect: Callable[[], str],
+        preview: FramePreview | None = None,
+    ) -> None:
+        collect_metrics = collect
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                path = self.path.split("?", 1)[0]
+                if path == "/preview" and preview is not None:
+                    self._stream_preview()
+                    return
+                if path != "/metrics":
+                    self.send_error(404)
+                    return
+                body = collect_metrics().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _stream_preview(self) -> None:
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+                self.send_header("Cache-Control", "no-cache, no-transform")
+                self.end_headers()
+
+                def write(chunk: bytes) -> None:
+                    self.wfile.write(chunk)
+                    self.wfile.flush()
+
+                try:
+                    preview.stream(write)
+                except (BrokenPipeError, ConnectionResetError):
+                    return
+
+            def log_message(self, format: str, *args: object) -> None:
+                return
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True)
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def render_prometheus(instruments: Instrumentation, gauges: Mapping[str, float]) -> str:
+    # Everything is formatted here on the scrape thread; the frame loop only bumps numbers.
+    lines: list[str] = []
+
+    for name, value in gauges.items():
+        lines.append(f"# TYPE {_PREFIX}_{name} gauge")
+        lines.append(f"{_PREFIX}_{name} {_format(value)}")
+
+    for name, value in instruments.counters.items():
+        lines.append(f"# TYPE {_PREFIX}_{name}_total counter")
+        lines.append(f"{_PREFIX}_{name}_total {value}")
+
+    for stage, histogram in instruments.histograms.items():
+        metric = f"{_PREFIX}_{stage}_seconds"
+        lines.append(f"# TYPE {metric} histogram")
+        cumulative = 0
+        for bound_ms, bucket in zip(histogram.bounds_ms, histogram.buckets):
+            cumulative += bucket
+            lines.append(f'{metric}_bucket{{le="{_format(bound_ms / 1000.0)}"}} {cumulative}')
+        # Count from the buckets themselves so a frame landing mid-scrape can't make
+        # the +Inf bucket disagree with the finite ones.
+        cumulative += histogram.buckets[-1]
+        lines.append(f'{metric}_bucket{{le="+Inf"}} {cumulative}')
+        lines.append(f"{metric}_sum {_format(histogram.total_seconds)}")
+        lines.append(f"{metric}_count {cumulative}")
+
+    lines.append("")
+    return "\n".join(lines)
+
+
+def _format(value: float) -> str:
+    return repr(float(value))
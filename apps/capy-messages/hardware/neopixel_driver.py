@@ -1,139 +1,264 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Protocol, Sequence
 
-from config import NEOPIXEL
+from config import NEOPIXEL, SEGMENTS, NeoPixelConfig, SegmentConfig
+from instrumentation import INSTRUMENTS
 
 
-RGB = tuple[int, int, int]
+# A failed Pi 5 SPI device is reopened after this delay, doubling up to the maximum.
+_REOPEN_INITIAL_SECONDS = 0.5
+_REOPEN_MAX_SECONDS = 30.0
 
 
 class PixelDriver(Protocol):
+    # False while the output is down and reinitializing; callers pause instead of rendering.
+    available: bool
+    # Outputs that fall back to their own look when a source goes quiet need the cleared
+    # frame re-sent this often while idle; None for strips that simply hold their last frame.
+    keepalive_seconds: float | None
+
     def begin(self) -> None:
         ...
 
     def clear(self) -> None:
         ...
 
-    def show(self, colors: Sequence[RGB]) -> None:
+    def show(self, frame: bytes) -> None:
         ...
 
 
 class NoopPixels:
+    available = True
+    keepalive_seconds = None
+
     def begin(self) -> None:
         return
 
     def clear(self) -> None:
         return
 
-    def show(self, colors: Sequence[RGB]) -> None:
+    def show(self, frame: bytes) -> None:
         return
 
 
 class RpiWs281xPixels:
-    def __init__(self) -> None:
+    keepalive_seconds = None
+
+    def __init__(self, config: NeoPixelConfig = NEOPIXEL) -> None:
         from rpi_ws281x import Color, PixelStrip
 
         supported_pins = {10, 12, 13, 18, 19, 21}
-        if NEOPIXEL.pin not in supported_pins:
+        if config.pin not in supported_pins:
             pins = ", ".join(str(pin) for pin in sorted(supported_pins))
             raise ValueError(
-                f"NEOPIXEL_PIN={NEOPIXEL.pin} is not supported by rpi_ws281x. "
+                f"NEOPIXEL_PIN={config.pin} is not supported by rpi_ws281x. "
                 f"Supported GPIO pins: {pins}."
             )
 
+        self.available = True
         self._color = Color
+        self._count = config.count
         self._strip = PixelStrip(
-            NEOPIXEL.count,
-            NEOPIXEL.pin,
-            NEOPIXEL.freq_hz,
-            NEOPIXEL.dma,
-            NEOPIXEL.invert,
-            NEOPIXEL.brightness,
-            NEOPIXEL.channel,
+            config.count,
+            config.pin,
+            config.freq_hz,
+            config.dma,
+            config.invert,
+            config.brightness,
+            config.channel,
         )
 
     def begin(self) -> None:
         self._strip.begin()
 
     def clear(self) -> None:
-        for i in range(NEOPIXEL.count):
+        for i in range(self._count):
             self._strip.setPixelColor(i, self._color(0, 0, 0))
         self._strip.show()
 
-    def show(self, colors: Sequence[RGB]) -> None:
-        for i in range(NEOPIXEL.count):
-            r, g, b = colors[i]
-            self._strip.setPixelColor(i, self._color(r, g, b))
+    def show(self, frame: bytes) -> None:
+        # Frames are packed RGB, which is already the 0xRRGGBB layout Color() builds.
+        for i in range(self._count):
+            offset = i * 3
+            self._strip.setPixelColor(i, int.from_bytes(frame[offset : offset + 3], "big"))
+        started_at = time.perf_counter()
         self._strip.show()
+        INSTRUMENTS.observe("push", time.perf_counter() - started_at)
 
 
 class Pi5NeoPixels:
-    def __init__(self) -> None:
+    keepalive_seconds = None
+
+    def __init__(self, config: NeoPixelConfig = NEOPIXEL) -> None:
         from pi5neo import Pi5Neo
 
-        if NEOPIXEL.pin != 10:
+        if config.pin != 10:
             print(
                 "NeoPixel pi5neo backend uses SPI MOSI (GPIO10). "
-                f"Current NEOPIXEL_PIN={NEOPIXEL.pin} is ignored."
+                f"Current NEOPIXEL_PIN={config.pin} is ignored."
             )
 
-        configured_spi_device = Path(NEOPIXEL.spi_device)
+        configured_spi_device = Path(config.spi_device)
         if configured_spi_device.exists():
             spi_device = str(configured_spi_device)
         else:
             spi_candidates = sorted(Path("/dev").glob("spidev*"))
             if not spi_candidates:
                 raise RuntimeError(
-                    f"SPI device not found at {NEOPIXEL.spi_device}. "
+                    f"SPI device not found at {config.spi_device}. "
                     "Enable SPI and verify /dev/spidev* is present."
                 )
             spi_device = str(spi_candidates[0])
             print(
-                f"Configured SPI device {NEOPIXEL.spi_device} not found; "
+                f"Configured SPI device {config.spi_device} not found; "
                 f"using {spi_device}."
             )
 
-        self._strip = Pi5Neo(
-            spi_device,
-            NEOPIXEL.count,
-            NEOPIXEL.spi_khz,
-        )
-        self._enabled = True
+        self._pi5neo = Pi5Neo
+        self._spi_device = spi_device
+        self._spi_khz = config.spi_khz
+        self._count = config.count
+        self._strip = self._open()
+        self.available = True
+        # The frame loop and the reopen thread both count failures.
+        self._counter_lock = threading.Lock()
+        self.failures = 0
+        self.reopens = 0
+
+    def _open(self):
+        return self._pi5neo(self._spi_device, self._count, self._spi_khz)
+
+    def _count_failure(self) -> int:
+        with self._counter_lock:
+            self.failures += 1
+            return self.failures
+
+    def _fail(self, exc: Exception) -> None:
+        INSTRUMENTS.increment("driver_errors")
+        self._count_failure()
+        if not self.available:
+            return
 
-    def _disable(self, exc: Exception) -> None:
-        if self._enabled:
-            print(
-                "NeoPixel pi5neo disabled after SPI error: "
-                f"{exc}. Check SPI interface and wiring."
-            )
-        self._enabled = False
+        self.available = False
+        print(f"NeoPixel pi5neo SPI error: {exc}. Reopening {self._spi_device} in the background.")
+        self._close_strip(self._strip)
+        threading.Thread(target=self._reopen_with_backoff, name="pi5neo-reopen", daemon=True).start()
+
+    def _reopen_with_backoff(self) -> None:
+        delay = _REOPEN_INITIAL_SECONDS
+        while True:
+            time.sleep(delay)
+            strip = None
+            try:
+                strip = self._open()
+                strip.clear_strip()
+                strip.update_strip()
+            except Exception as exc:
+                if strip is not None:
+                    self._close_strip(strip)
+                self._count_failure()
+                delay = min(delay * 2, _REOPEN_MAX_SECONDS)
+                print(f"NeoPixel pi5neo reopen failed ({exc}); retrying in {delay:.1f}s.")
+                continue
+
+            self._strip = strip
+            with self._counter_lock:
+                self.reopens += 1
+                failures = self.failures
+            INSTRUMENTS.increment("driver_reopens")
+            self.available = True
+            print(f"NeoPixel pi5neo SPI output restored ({failures} failures so far).")
+            return
+
+    def _close_strip(self, strip) -> None:
+        # Older pi5neo releases have no close(), so release the spidev handle directly;
+        # otherwise every reopen leaks a file descriptor.
+        spi = getattr(strip, "spi", None)
+        if spi is None:
+            print(f"NeoPixel pi5neo strip has no SPI handle to close for {self._spi_device}.")
+            return
+        try:
+            spi.close()
+        except OSError as exc:
+            print(f"NeoPixel pi5neo SPI close failed ({self._spi_device}): {exc}")
 
     def begin(self) -> None:
-        if not self._enabled:
+        if not self.available:
             return
         self.clear()
 
     def clear(self) -> None:
-        if not self._enabled:
+        if not self.available:
             return
         try:
             self._strip.clear_strip()
             self._strip.update_strip()
         except Exception as exc:
-            self._disable(exc)
+            self._fail(exc)
 
-    def show(self, colors: Sequence[RGB]) -> None:
-        if not self._enabled:
+    def show(self, frame: bytes) -> None:
+        if not self.available:
             return
-        for i in range(NEOPIXEL.count):
-            r, g, b = colors[i]
-            self._strip.set_led_color(i, r, g, b)
+        strip = self._strip
+        for i in range(self._count):
+            offset = i * 3
+            strip.set_led_color(i, frame[offset], frame[offset + 1], frame[offset + 2])
+        started_at = time.perf_counter()
         try:
-            self._strip.update_strip()
+            strip.update_strip()
         except Exception as exc:
-            self._disable(exc)
+            self._fail(exc)
+            return
+        INSTRUMENTS.observe("push", time.perf_counter() - started_at)
+
 
+class SegmentedPixels:
+    def __init__(self, outputs: Sequence[tuple[PixelDriver, int]]) -> None:
+        self._outputs: list[tuple[PixelDriver, int, int]] = []
+        start = 0
+        for driver, count in outputs:
+            self._outputs.append((driver, start, start + count * 3))
+            start += count * 3
+
+        # Strip pushes block in SPI/DMA syscalls that release the GIL, so they overlap.
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, len(self._outputs)),
+            thread_name_prefix="pixel-output",
+        )
 
+    @property
+    def available(self) -> bool:
+        return any(driver.available for driver, _, _ in self._outputs)
+
+    @property
+    def keepalive_seconds(self) -> float | None:
+        intervals = [driver.keepalive_seconds for driver, _, _ in self._outputs if driver.keepalive_seconds is not None]
+        return min(intervals, default=None)
+
+    def begin(self) -> None:
+        self._for_each(lambda driver, view: driver.begin())
+
+    def clear(self) -> None:
+        self._for_each(lambda driver, view: driver.clear())
+
+    def show(self, frame: bytes) -> None:
+        self._for_each(lambda driver, view: driver.show(view), frame)
+
+    def _for_each(self, action, frame: bytes = b"") -> None:
+        view = memoryview(frame)
+        futures = [
+            self._executor.submit(action, driver, view[start:end])
+            for driver, start, end in self._outputs
+        ]
+        for future in futures:
+            future.result()
+
+
+@lru_cache(maxsize=1)
 def _read_pi_model() -> str:
     model_path = Path("/proc/device-tree/model")
     if not model_path.exists():
@@ -145,23 +270,32 @@ def _is_pi5() -> bool:
     return "Raspberry Pi 5" in _read_pi_model()
 
 
-def build_pixel_driver() -> PixelDriver:
-    if NEOPIXEL.backend not in {"auto", "pi5neo", "rpi_ws281x", "off"}:
-        print(f"Unknown NEOPIXEL_BACKEND='{NEOPIXEL.backend}', disabling NeoPixels.")
+def build_pixel_driver(config: NeoPixelConfig = NEOPIXEL) -> PixelDriver:
+    if config.backend not in {"auto", "pi5neo", "rpi_ws281x", "ddp", "e131", "off"}:
+        print(f"Unknown NEOPIXEL_BACKEND='{config.backend}', disabling NeoPixels.")
         return NoopPixels()
 
-    if NEOPIXEL.backend == "off":
+    if config.backend == "off":
         return NoopPixels()
 
-    if NEOPIXEL.backend in {"auto", "pi5neo"} and _is_pi5():
+    if config.backend in {"ddp", "e131"}:
+        from network_pixels import DdpPixels, E131Pixels
+
+        try:
+            return DdpPixels(config) if config.backend == "ddp" else E131Pixels(config)
+        except Exception as exc:
+            print(f"NeoPixel {config.backend} network output init failed: {exc}")
+            return NoopPixels()
+
+    if config.backend in {"auto", "pi5neo"} and _is_pi5():
         try:
-            return Pi5NeoPixels()
+            return Pi5NeoPixels(config)
         except Exception as exc:
             print(f"NeoPixel pi5neo init failed: {exc}")
-            if NEOPIXEL.backend == "pi5neo":
+            if config.backend == "pi5neo":
                 return NoopPixels()
 
-    if NEOPIXEL.backend == "auto" and _is_pi5():
+    if config.backend == "auto" and _is_pi5():
         print(
             "Pi 5 detected: skipping rpi_ws281x auto fallback to avoid "
             "ws2811_init hardware-revision crashes."
@@ -169,7 +303,18 @@ def build_pixel_driver() -> PixelDriver:
         return NoopPixels()
 
     try:
-        return RpiWs281xPixels()
+        return RpiWs281xPixels(config)
     except Exception as exc:
         print(f"NeoPixel rpi_ws281x init failed: {exc}")
         return NoopPixels()
+
+
+def build_output_driver(segments: Sequence[SegmentConfig] = SEGMENTS) -> PixelDriver:
+    if len(segments) == 1:
+        return build_pixel_driver(segments[0].output)
+
+    outputs: list[tuple[PixelDriver, int]] = []
+    for segment in segments:
+        print(f"NeoPixel segment '{segment.name}': {segment.output.count} pixels via {segment.output.backend}.")
+        outputs.append((build_pixel_driver(segment.output), segment.output.count))
+    return SegmentedPixels(outputs)
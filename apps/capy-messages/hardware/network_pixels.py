@@ -0,0 +1,175 @@
+import abc
+import socket
+import struct
+import time
+import uuid
+
+from config import NeoPixelConfig
+from instrumentation import INSTRUMENTS
+
+DDP_PORT = 4048
+E131_PORT = 5568
+
+# DDP: version 1 header, RGB 8-bit data type, display destination id.
+_DDP_HEADER = struct.Struct(">BBBBLH")
+_DDP_VERSION_1 = 0x40
+_DDP_PUSH = 0x01
+_DDP_TYPE_RGB24 = 0x0B
+_DDP_DESTINATION_DISPLAY = 0x01
+_DDP_MAX_PAYLOAD = 1440
+
+_E131_HEADER_SIZE = 126
+_E131_PIXELS_PER_UNIVERSE = 170
+_E131_SEQUENCE_OFFSET = 111
+
+# Receivers drop to a fallback look when a source goes quiet, so unchanged chunks are
+# still re-sent at this interval when skip-unchanged is on.
+_KEEPALIVE_SECONDS = 1.0
+
+
+class _UdpPixels(abc.ABC):
+    keepalive_seconds = _KEEPALIVE_SECONDS
+
+    def __init__(self, config: NeoPixelConfig, chunk_bytes: int) -> None:
+        if not config.net_host and not self._allows_multicast():
+            raise ValueError(f"NEOPIXEL_NET_HOST is required for the {config.backend} backend.")
+
+        self._frame_size = config.count * 3
+        self._skip_unchanged = config.net_skip_unchanged
+        self._chunks = [
+            (start, min(start + chunk_bytes, self._frame_size))
+            for start in range(0, self._frame_size, chunk_bytes)
+        ]
+        self._previous = bytearray(self._frame_size)
+        self._next_full_send_at = 0.0
+        self._error_logged = False
+        self.available = True
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def begin(self) -> None:
+        return
+
+    def clear(self) -> None:
+        self._next_full_send_at = 0.0
+        self.show(bytes(self._frame_size))
+
+    def show(self, frame: bytes) -> None:
+        view = memoryview(frame)
+        now = time.monotonic()
+        send_all = not self._skip_unchanged or now >= self._next_full_send_at
+        if send_all:
+            self._next_full_send_at = now + _KEEPALIVE_SECONDS
+            chunks = list(range(len(self._chunks)))
+        else:
+            previous = memoryview(self._previous)
+            chunks = [
+                index
+                for index, (start, end) in enumerate(self._chunks)
+                if view[start:end] != previous[start:end]
+            ]
+
+        started_at = time.perf_counter()
+        try:
+            # Header and pixel data go out as separate iovecs, so frame bytes are never copied.
+            for index, is_last in zip(chunks, _last_flags(len(chunks))):
+                start, end = self._chunks[index]
+                header, address = self._packet_header(index, start, end, is_last)
+                self._socket.sendmsg([header, view[start:end]], [], 0, address)
+        except OSError as exc:
+            INSTRUMENTS.increment("driver_errors")
+            if not self._error_logged:
+                print(f"NeoPixel network output send failed: {exc}")
+                self._error_logged = True
+            return
+
+        self._error_logged = False
+        INSTRUMENTS.observe("push", time.perf_counter() - started_at)
+        if self._skip_unchanged:
+            self._previous[:] = view
+
+    @staticmethod
+    def _allows_multicast() -> bool:
+        return False
+
+    @abc.abstractmethod
+    def _packet_header(self, index: int, start: int, end: int, is_last: bool) -> tuple[bytes, tuple[str, int]]:
+        ...
+
+
+class DdpPixels(_UdpPixels):
+    def __init__(self, config: NeoPixelConfig) -> None:
+        super().__init__(config, _DDP_MAX_PAYLOAD)
+        self._address = (config.net_host, config.net_port or DDP_PORT)
+        self._sequence = 0
+
+    def show(self, frame: bytes) -> None:
+        # DDP sequence numbers run 1..15 per frame; 0 means "not used".
+        self._sequence = self._sequence % 15 + 1
+        super().show(frame)
+
+    def _packet_header(self, index: int, start: int, end: int, is_last: bool) -> tuple[bytes, tuple[str, int]]:
+        flags = _DDP_VERSION_1 | (_DDP_PUSH if is_last else 0)
+        header = _DDP_HEADER.pack(
+            flags,
+            self._sequence,
+            _DDP_TYPE_RGB24,
+            _DDP_DESTINATION_DISPLAY,
+            start,
+            end - start,
+        )
+        return header, self._address
+
+
+class E131Pixels(_UdpPixels):
+    def __init__(self, config: NeoPixelConfig) -> None:
+        super().__init__(config, _E131_PIXELS_PER_UNIVERSE * 3)
+        self._port = config.net_port or E131_PORT
+        self._headers: list[bytearray] = []
+        self._addresses: list[tuple[str, int]] = []
+        cid = uuid.uuid4().bytes
+        for index, (start, end) in enumerate(self._chunks):
+            universe = config.net_universe + index
+            self._headers.append(_e131_header(cid, universe, end - start))
+            host = config.net_host or f"239.255.{universe >> 8}.{universe & 0xFF}"
+            self._addresses.append((host, self._port))
+
+    @staticmethod
+    def _allows_multicast() -> bool:
+        return True
+
+    def _packet_header(self, index: int, start: int, end: int, is_last: bool) -> tuple[bytes, tuple[str, int]]:
+        header = self._headers[index]
+        header[_E131_SEQUENCE_OFFSET] = (header[_E131_SEQUENCE_OFFSET] + 1) & 0xFF
+        return header, self._addresses[index]
+
+
+def _last_flags(count: int) -> list[bool]:
+    return [index == count - 1 for index in range(count)]
+
+
+def _e131_header(cid: bytes, universe: int, data_length: int) -> bytearray:
+    packet_length = _E131_HEADER_SIZE + data_length
+    header = bytearray(_E131_HEADER_SIZE)
+
+    # Root layer
+    struct.pack_into(">HH12s", header, 0, 0x0010, 0x0000, b"ASC-E1.17\x00\x00\x00")
+    struct.pack_into(">HL16s", header, 16, 0x7000 | (packet_length - 16), 0x00000004, cid)
+
+    # Framing layer
+    struct.pack_into(">HL64s", header, 38, 0x7000 | (packet_length - 38), 0x00000002, b"capy-messages")
+    struct.pack_into(">BHBBH", header, 108, 100, 0, 0, 0, universe)
+
+    # DMP layer: one start code plus the channel data.
+    struct.pack_into(
+        ">HBBHHHB",
+        header,
+        115,
+        0x7000 | (packet_length - 115),
+        0x02,
+        0xA1,
+        0x0000,
+        0x0001,
+        data_length + 1,
+        0x00,
+    )
+    return header
@@ -0,0 +1,54 @@
+DITHER_PHASES = 4
+
+_IDENTITY = bytes(range(256))
+
+
+class OutputStage:
+    def __init__(self, gamma: float = 1.0, brightness: float = 1.0, dither: bool = True) -> None:
+        self._gamma = gamma
+        self._phases = DITHER_PHASES if dither else 1
+        self._tables_by_brightness: dict[int, list[bytes]] = {}
+        self._tables: list[bytes] = []
+        self._identity = False
+        self.set_brightness(brightness)
+
+    def set_brightness(self, brightness: float) -> None:
+        level = round(max(0.0, min(1.0, brightness)) * 255)
+        tables = self._tables_by_brightness.get(level)
+        if tables is None:
+            tables = _build_tables(self._gamma, level / 255, self._phases)
+            self._tables_by_brightness[level] = tables
+        self._tables = tables
+        self._identity = all(table == _IDENTITY for table in tables)
+
+    def process(self, frame: bytes, frame_index: int) -> bytes:
+        if self._identity:
+            return frame
+        if self._phases == 1:
+            return frame.translate(self._tables[0])
+
+        # Pixel i uses dither phase (frame_index + i) % phases, so neighbours never
+        # flicker in step. Each (pixel residue, channel) pair is one strided slice.
+        phases = self._phases
+        stride = phases * 3
+        out = bytearray(len(frame))
+        for residue in range(phases):
+            table = self._tables[(frame_index + residue) % phases]
+            for channel in range(3):
+                start = residue * 3 + channel
+                out[start::stride] = frame[start::stride].translate(table)
+        return bytes(out)
+
+
+def _build_tables(gamma: float, brightness: float, phases: int) -> list[bytes]:
+    # Ordered temporal dither: phase k rounds up once the fractional part passes (k + 0.5) / phases,
+    # so over `phases` frames each level averages to its exact fractional value.
+    tables: list[bytes] = []
+    for phase in range(phases):
+        threshold = (phase + 0.5) / phases if phases > 1 else 0.5
+        table = bytearray(256)
+        for value in range(256):
+            level = ((value / 255) ** gamma) * brightness * 255
+            table[value] = min(255, int(level + 1.0 - threshold))
+        tables.append(bytes(table))
+    return tables
@@ -0,0 +1,248 @@
+import multiprocessing
+import os
+import struct
+import time
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Callable
+
+from neopixel_driver import PixelDriver
+
+# Shared memory layout:
+#   [0:8]    frames written by the renderer
+#   [8:16]   stop flag
+#   [16:72]  worker stats and driver availability, see _STATS
+#   [72:]    ring slots, each a _SLOT header followed by one packed RGB frame
+_WRITTEN = struct.Struct("<Q")
+_STOP_OFFSET = 8
+_STATS = struct.Struct("<QQQQdd?7x")
+_STATS_OFFSET = 16
+_RING_OFFSET = 72
+_SLOT = struct.Struct("<QdB7x")
+
+_COMMAND_SHOW = 0
+_COMMAND_CLEAR = 1
+
+
+@dataclass(frozen=True)
+class OutputWorkerStats:
+    frames_shown: int
+    frames_dropped: int
+    underruns: int
+    errors: int
+    latency_last_ms: float
+    latency_max_ms: float
+
+
+class ProcessPixelDriver:
+    # The worker re-sends the cleared frame to outputs that need a keepalive.
+    keepalive_seconds = None
+
+    def __init__(
+        self,
+        build_driver: Callable[[], PixelDriver],
+        frame_size: int,
+        slots: int = 4,
+        frame_period_seconds: float = 0.02,
+        realtime_priority: int = 0,
+    ) -> None:
+        self._frame_size = frame_size
+        self._slots = max(2, slots)
+        self._slot_size = _SLOT.size + frame_size
+        self._shm = shared_memory.SharedMemory(
+            create=True,
+            size=_RING_OFFSET + self._slots * self._slot_size,
+        )
+        self._buffer = self._shm.buf
+        self._buffer[: _RING_OFFSET] = bytes(_RING_OFFSET)
+        # Assume the output is up until the worker has built its driver and says otherwise.
+        _STATS.pack_into(self._buffer, _STATS_OFFSET, 0, 0, 0, 0, 0.0, 0.0, True)
+        self._written = 0
+
+        # Fork keeps the shared mapping and the semaphore without pickling either.
+        context = multiprocessing.get_context("fork")
+        self._ready = context.Semaphore(0)
+        self._process = context.Process(
+            target=_run_output_worker,
+            args=(
+                build_driver,
+                self._buffer,
+                self._ready,
+                frame_size,
+                self._slots,
+                frame_period_seconds,
+                realtime_priority,
+            ),
+            name="pixel-output-worker",
+            daemon=True,
+        )
+        self._process.start()
+
+    @property
+    def available(self) -> bool:
+        # Mirrors the worker's driver, so the frame loop pauses while it reinitializes.
+        return _STATS.unpack_from(self._buffer, _STATS_OFFSET)[6]
+
+    def begin(self) -> None:
+        return
+
+    def clear(self) -> None:
+        self._publish(b"", _COMMAND_CLEAR)
+
+    def show(self, frame: bytes) -> None:
+        self._publish(frame, _COMMAND_SHOW)
+
+    def stats(self) -> OutputWorkerStats:
+        shown, dropped, underruns, errors, latency_last, latency_max, _ = _STATS.unpack_from(
+            self._buffer, _STATS_OFFSET
+        )
+        return OutputWorkerStats(
+            frames_shown=shown,
+            frames_dropped=dropped,
+            underruns=underruns,
+            errors=errors,
+            latency_last_ms=latency_last * 1000.0,
+            latency_max_ms=latency_max * 1000.0,
+        )
+
+    def close(self) -> None:
+        self._buffer[_STOP_OFFSET] = 1
+        self._ready.release()
+        self._process.join(timeout=1.0)
+        if self._process.is_alive():
+            self._process.terminate()
+
+        stats = self.stats()
+        print(
+            "Pixel output worker stopped: "
+            f"shown={stats.frames_shown} dropped={stats.frames_dropped} "
+            f"underruns={stats.underruns} errors={stats.errors} "
+            f"max_latency={stats.latency_max_ms:.1f}ms"
+        )
+
+        self._buffer = None
+        self._shm.close()
+        self._shm.unlink()
+
+    def _publish(self, frame: bytes, command: int) -> None:
+        index = self._written
+        base = _RING_OFFSET + (index % self._slots) * self._slot_size
+
+        # Per-slot seqlock: odd while writing, even once the slot is complete.
+        _WRITTEN.pack_into(self._buffer, base, 2 * index + 1)
+        if command == _COMMAND_SHOW:
+            self._buffer[base + _SLOT.size : base + _SLOT.size + self._frame_size] = frame
+        _SLOT.pack_into(self._buffer, base, 2 * index + 1, time.monotonic(), command)
+        _WRITTEN.pack_into(self._buffer, base, 2 * index + 2)
+
+        self._written = index + 1
+        _WRITTEN.pack_into(self._buffer, 0, self._written)
+        self._ready.release()
+
+
+def _run_output_worker(
+    build_driver: Callable[[], PixelDriver],
+    buffer: memoryview,
+    ready,
+    frame_size: int,
+    slots: int,
+    frame_period_seconds: float,
+    realtime_priority: int,
+) -> None:
+    if realtime_priority > 0:
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(realtime_priority))
+        except (AttributeError, OSError) as exc:
+            print(f"Pixel output worker could not get SCHED_FIFO priority {realtime_priority}: {exc}")
+
+    driver = build_driver()
+    driver.begin()
+
+    slot_size = _SLOT.size + frame_size
+    shown = dropped = underruns = errors = 0
+    latency_last = latency_max = 0.0
+    consumed = 0
+    streaming = False
+    keepalive_at: float | None = None
+    available = driver.available
+    # Gap between published frames, which follows the governor's frame rate. It rises at
+    # once when frames slow down and eases back when they speed up.
+    publish_interval = frame_period_seconds
+    last_published_at: float | None = None
+
+    def publish_stats() -> None:
+        _STATS.pack_into(
+            buffer, _STATS_OFFSET, shown, dropped, underruns, errors, latency_last, latency_max, available
+        )
+
+    publish_stats()
+    while not buffer[_STOP_OFFSET]:
+        # While frames are streaming, a gap of two publish intervals counts as an underrun.
+        timeout = publish_interval * 2 if streaming else 0.5
+        if keepalive_at is not None:
+            timeout = min(timeout, max(0.0, keepalive_at - time.monotonic()))
+        signalled = ready.acquire(timeout=timeout)
+        while ready.acquire(False):
+            pass
+        if buffer[_STOP_OFFSET]:
+            break
+
+        if driver.available != available:
+            # The renderer pauses while the driver is down, so the stream restarts afterwards.
+            available = driver.available
+            streaming = False
+            last_published_at = None
+            publish_stats()
+
+        written = _WRITTEN.unpack_from(buffer, 0)[0]
+        if written == consumed:
+            if streaming and available and not signalled:
+                underruns += 1
+                publish_stats()
+            elif keepalive_at is not None and time.monotonic() >= keepalive_at:
+                try:
+                    driver.clear()
+                except Exception as exc:
+                    errors += 1
+                    print(f"Pixel output worker driver error: {exc}")
+                keepalive_at = time.monotonic() + driver.keepalive_seconds
+            continue
+
+        # Always jump to the newest frame; anything older is stale by now.
+        index = written - 1
+        base = _RING_OFFSET + (index % slots) * slot_size
+        sequence, published_at, command = _SLOT.unpack_from(buffer, base)
+        frame = bytes(buffer[base + _SLOT.size : base + _SLOT.size + frame_size])
+        if sequence != 2 * index + 2 or _WRITTEN.unpack_from(buffer, base)[0] != sequence:
+            continue
+
+        if command == _COMMAND_SHOW and last_published_at is not None:
+            interval = (published_at - last_published_at) / (written - consumed)
+            publish_interval = max(interval, publish_interval + (interval - publish_interval) * 0.2)
+        last_published_at = published_at if command == _COMMAND_SHOW else None
+        dropped += written - consumed - 1
+        consumed = written
+
+        try:
+            if command == _COMMAND_CLEAR:
+                driver.clear()
+                streaming = False
+                if driver.keepalive_seconds is not None:
+                    keepalive_at = time.monotonic() + driver.keepalive_seconds
+            else:
+                driver.show(frame)
+                streaming = True
+                keepalive_at = None
+                shown += 1
+        except Exception as exc:
+            errors += 1
+            print(f"Pixel output worker driver error: {exc}")
+
+        latency_last = time.monotonic() - published_at
+        latency_max = max(latency_max, latency_last)
+        publish_stats()
+
+    try:
+        driver.clear()
+    except Exception:
+        pass
@@ -1,3 +1,14 @@
+from .compiler import MAX_QUALITY
+from .registry import PatternSpec, register_description, register_pattern
 from .renderer import PatternRenderer
+from .segments import SegmentedRenderer, build_segment_renderer
 
-__all__ = ["PatternRenderer"]
+__all__ = [
+    "MAX_QUALITY",
+    "PatternRenderer",
+    "PatternSpec",
+    "SegmentedRenderer",
+    "build_segment_renderer",
+    "register_description",
+    "register_pattern",
+]
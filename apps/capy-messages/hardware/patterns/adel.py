@@ -1,10 +1,31 @@
+import os
 import random
 
-from .common import RGB
+from backgrounds import ADEL_PATTERN
 
+from .registry import PatternSpec, register_pattern
 
-def render_adel_frame(pixel_count: int, rng: random.Random) -> list[RGB]:
-    colors: list[RGB] = []
-    for _ in range(pixel_count):
-        colors.append((rng.randint(0, 255), rng.randint(0, 255), rng.randint(0, 255)))
-    return colors
+
+class NoiseFrameSource:
+    def __init__(self, pixel_count: int, rng: random.Random | None = None) -> None:
+        self._size = max(0, pixel_count) * 3
+        self._rng = rng
+
+    def reset(self) -> None:
+        return
+
+    def evict(self) -> None:
+        return
+
+    def set_quality(self, quality: int) -> None:
+        return
+
+    def render(self, frame: int) -> bytes:
+        # One bulk draw per frame; the buffer is already packed RGB for the driver.
+        if self._rng is None:
+            return os.urandom(self._size)
+        return self._rng.randbytes(self._size)
+
+
+# Intentionally bypass smoothing so this mode can flash at max frame rate.
+register_pattern(PatternSpec(name=ADEL_PATTERN, factory=NoiseFrameSource, smoothed=False, sharp=True))
@@ -1,3 +1,8 @@
+from functools import lru_cache
+from itertools import repeat
+from operator import add, itemgetter, mul, rshift, sub
+from typing import Sequence
+
 RGB = tuple[int, int, int]
 
 
@@ -13,3 +18,39 @@ def blend_rgb(base: RGB, overlay: RGB, alpha: float) -> RGB:
         int(base[1] * inv + overlay[1] * alpha),
         int(base[2] * inv + overlay[2] * alpha),
     )
+
+
+def pack_rgb(colors: Sequence[RGB]) -> bytearray:
+    return bytearray([channel for color in colors for channel in color])
+
+
+def upsample_rgb(packed: bytes | bytearray, pixel_count: int) -> bytearray:
+    source_count = len(packed) // 3
+    if source_count == pixel_count:
+        return bytearray(packed)
+    if source_count < 2:
+        return bytearray(bytes(packed[:3]) * pixel_count)
+
+    # One pass of C-level maps over every output byte: a + ((b - a) * w >> 8).
+    get_low, get_high, weights = _upsample_plan(source_count, pixel_count)
+    low = get_low(packed)
+    return bytearray(map(add, low, map(rshift, map(mul, map(sub, get_high(packed), low), weights), repeat(8))))
+
+
+@lru_cache(maxsize=8)
+def _upsample_plan(source_count: int, pixel_count: int) -> tuple[itemgetter, itemgetter, list[int]]:
+    # Per output byte: the two source bytes it sits between and the 8-bit weight of the
+    # second, with the source points spread evenly from the first pixel to the last.
+    scale = (source_count - 1) / max(1, pixel_count - 1)
+    low: list[int] = []
+    high: list[int] = []
+    weights: list[int] = []
+    for index in range(pixel_count):
+        position = index * scale
+        left = min(int(position), source_count - 2)
+        weight = int((position - left) * 256)
+        for channel in range(3):
+            low.append(left * 3 + channel)
+            high.append(left * 3 + 3 + channel)
+            weights.append(weight)
+    return itemgetter(*low), itemgetter(*high), weights
@@ -0,0 +1,399 @@
+import colorsys
+import math
+import operator
+from collections import Counter
+from dataclasses import dataclass
+from itertools import repeat
+from typing import Callable
+
+from .dsl import (
+    Binary,
+    Blend,
+    Clamp,
+    Color,
+    Const,
+    Detail,
+    FrameCounter,
+    Hsv,
+    PatternDescription,
+    PixelCount,
+    PixelIndex,
+    Signal,
+    Solid,
+    Unary,
+)
+from .common import upsample_rgb
+
+_BINARY_OPS: dict[str, Callable] = {
+    "add": operator.add,
+    "sub": operator.sub,
+    "mul": operator.mul,
+    "div": operator.truediv,
+    "mod": operator.mod,
+    "pow": operator.pow,
+    "max": max,
+}
+
+_UNARY_OPS: dict[str, Callable] = {
+    "neg": operator.neg,
+    "sin": math.sin,
+    "exp": math.exp,
+    "int": int,
+    "round": round,
+}
+
+_MAX_CACHED_PIXEL_COUNTS = 4
+
+
+@dataclass(frozen=True)
+class QualityLevel:
+    # Fraction of the pixels actually evaluated; the rest are interpolated.
+    resolution: float = 1.0
+    # Keep layers wrapped in detail().
+    detail: bool = True
+
+
+# Table lookups (hue, sine) are slower than colorsys and math.sin from Python, so
+# every level saves time by evaluating fewer layers or fewer pixels. detail() layers
+# carry the fastest per-LED terms, so they go before any pixel is interpolated; sharp
+# patterns never interpolate at all.
+QUALITY_LEVELS = (
+    QualityLevel(),
+    QualityLevel(detail=False),
+    QualityLevel(resolution=0.5, detail=False),
+    QualityLevel(resolution=0.25, detail=False),
+)
+MAX_QUALITY = len(QUALITY_LEVELS) - 1
+
+
+class _FrameContext:
+    __slots__ = ("frame", "pixel_count", "index", "tables", "shared")
+
+    def __init__(self, frame: int, pixel_count: int, index: list[int], tables: dict) -> None:
+        self.frame = frame
+        self.pixel_count = pixel_count
+        self.index = index
+        self.tables = tables
+        self.shared: dict[int, object] = {}
+
+
+Evaluator = Callable[[_FrameContext], object]
+
+
+@dataclass(frozen=True)
+class _Compiled:
+    evaluate: Evaluator
+    per_frame: bool
+    per_pixel: bool
+    constant: object = None
+
+    @property
+    def is_constant(self) -> bool:
+        return not self.per_frame and not self.per_pixel and self.constant is not None
+
+
+class CompiledPattern:
+    def __init__(self, description: PatternDescription) -> None:
+        self.name = description.name
+        self._color = description.color
+        self._uses = Counter()
+        _count_uses(description.color, self._uses)
+        self._slots = 0
+        self._level = QUALITY_LEVELS[0]
+        self._nodes: dict[object, _Compiled] = {}
+        self._roots: dict[int, _Compiled] = {0: self._compile(description.color)}
+        self._tables: dict[tuple[int, int], dict] = {}
+
+    def render(
+        self, pixel_count: int, frame: int, quality: int = 0, control_points: int = 0, sharp: bool = False
+    ) -> bytearray:
+        if pixel_count <= 0:
+            return bytearray()
+
+        quality = max(0, min(MAX_QUALITY, quality))
+        root = self._roots.get(quality)
+        if root is None:
+            root = self._roots[quality] = self._compile_level(quality)
+
+        # Sharp patterns only give up detail layers; interpolation would smear them.
+        resolution = 1.0 if sharp else QUALITY_LEVELS[quality].resolution
+        samples = pixel_count if resolution >= 1.0 else min(pixel_count, max(2, math.ceil(pixel_count * resolution)))
+        if control_points >= 2:
+            samples = min(samples, control_points)
+        tables = self._tables.get((pixel_count, samples))
+        if tables is None:
+            if len(self._tables) >= _MAX_CACHED_PIXEL_COUNTS:
+                self._tables.clear()
+            tables = {"index": _sample_positions(pixel_count, samples)}
+            self._tables[(pixel_count, samples)] = tables
+
+        context = _FrameContext(frame, pixel_count, tables["index"], tables)
+        channels = root.evaluate(context)
+
+        packed = bytearray(samples * 3)
+        for offset, channel in enumerate(channels):
+            packed[offset::3] = channel if type(channel) is list else bytes((channel,)) * samples
+        if samples != pixel_count:
+            return upsample_rgb(packed, pixel_count)
+        return packed
+
+    def evict(self) -> None:
+        self._tables.clear()
+
+    def _compile_level(self, quality: int) -> _Compiled:
+        # Each level is its own graph; slots stay unique so levels can share tables.
+        self._level = QUALITY_LEVELS[quality]
+        self._nodes = {}
+        return self._compile(self._color)
+
+    def _next_slot(self) -> int:
+        self._slots += 1
+        return self._slots
+
+    def _compile(self, node: Signal | Color) -> _Compiled:
+        compiled = self._nodes.get(node)
+        if compiled is not None:
+            return compiled
+
+        compiled = self._compile_node(node)
+        if not compiled.is_constant:
+            if not compiled.per_frame:
+                compiled = _cache_in_tables(compiled, self._next_slot())
+            elif self._uses[node] > 1:
+                compiled = _share_within_frame(compiled, self._next_slot())
+
+        self._nodes[node] = compiled
+        return compiled
+
+    def _compile_node(self, node: Signal | Color) -> _Compiled:
+        if isinstance(node, Const):
+            return _constant(node.value)
+        if isinstance(node, FrameCounter):
+            return _Compiled(lambda ctx: ctx.frame, per_frame=True, per_pixel=False)
+        if isinstance(node, PixelIndex):
+            return _Compiled(lambda ctx: ctx.index, per_frame=False, per_pixel=True)
+        if isinstance(node, PixelCount):
+            return _Compiled(lambda ctx: ctx.pixel_count, per_frame=False, per_pixel=False)
+        if isinstance(node, Binary):
+            return _compile_binary(_BINARY_OPS[node.op], self._compile(node.left), self._compile(node.right))
+        if isinstance(node, Unary):
+            return _compile_unary(_UNARY_OPS[node.op], self._compile(node.operand))
+        if isinstance(node, Clamp):
+            return _compile_clamp(self._compile(node.value), node.lo, node.hi)
+        if isinstance(node, Solid):
+            return _constant(tuple(node.rgb))
+        if isinstance(node, Hsv):
+            return _compile_hsv(self._compile(node.h), self._compile(node.s), self._compile(node.v))
+        if isinstance(node, Detail):
+            return self._compile(node.full if self._level.detail else node.reduced)
+        if isinstance(node, Blend):
+            return _compile_blend(
+                self._compile(node.base),
+                self._compile(node.overlay),
+                self._compile(Clamp(node.alpha, 0.0, 1.0)),
+            )
+        raise TypeError(f"Unsupported pattern node: {node!r}")
+
+
+class SignalPattern:
+    def __init__(
+        self, compiled: CompiledPattern, pixel_count: int, control_points: int = 0, sharp: bool = False
+    ) -> None:
+        self._compiled = compiled
+        self._pixel_count = pixel_count
+        self._control_points = control_points
+        self._sharp = sharp
+        self._quality = 0
+
+    def render(self, frame: int) -> bytearray:
+        return self._compiled.render(self._pixel_count, frame, self._quality, self._control_points, self._sharp)
+
+    def set_quality(self, quality: int) -> None:
+        self._quality = quality
+
+    def reset(self) -> None:
+        return
+
+    def evict(self) -> None:
+        self._compiled.evict()
+
+
+def compile_pattern(description: PatternDescription) -> CompiledPattern:
+    return CompiledPattern(description)
+
+
+def _count_uses(node: object, uses: Counter) -> None:
+    uses[node] += 1
+    if uses[node] > 1:
+        return
+    for child in _children(node):
+        _count_uses(child, uses)
+
+
+def _children(node: object) -> tuple:
+    if isinstance(node, Binary):
+        return (node.left, node.right)
+    if isinstance(node, Unary):
+        return (node.operand,)
+    if isinstance(node, Clamp):
+        return (node.value,)
+    if isinstance(node, Hsv):
+        return (node.h, node.s, node.v)
+    if isinstance(node, Blend):
+        return (node.base, node.overlay, node.alpha)
+    if isinstance(node, Detail):
+        return (node.full, node.reduced)
+    return ()
+
+
+def _sample_positions(pixel_count: int, samples: int) -> list:
+    if samples == pixel_count:
+        return list(range(pixel_count))
+    # Evenly spaced from the first pixel to the last, matching upsample_rgb().
+    scale = (pixel_count - 1) / (samples - 1)
+    return [index * scale for index in range(samples)]
+
+
+def _constant(value: object) -> _Compiled:
+    return _Compiled(lambda ctx: value, per_frame=False, per_pixel=False, constant=value)
+
+
+def _cache_in_tables(compiled: _Compiled, slot: int) -> _Compiled:
+    evaluate = compiled.evaluate
+
+    # Frame-independent terms are built once per pixel count and reused every frame.
+    def cached(ctx: _FrameContext) -> object:
+        try:
+            return ctx.tables[slot]
+        except KeyError:
+            value = ctx.tables[slot] = evaluate(ctx)
+            return value
+
+    return _Compiled(cached, per_frame=False, per_pixel=compiled.per_pixel)
+
+
+def _share_within_frame(compiled: _Compiled, slot: int) -> _Compiled:
+    evaluate = compiled.evaluate
+
+    def shared(ctx: _FrameContext) -> object:
+        try:
+            return ctx.shared[slot]
+        except KeyError:
+            value = ctx.shared[slot] = evaluate(ctx)
+            return value
+
+    return _Compiled(shared, per_frame=True, per_pixel=compiled.per_pixel)
+
+
+def _column(value: object) -> object:
+    return value if type(value) is list else repeat(value)
+
+
+def _compile_binary(op: Callable, left: _Compiled, right: _Compiled) -> _Compiled:
+    per_frame = left.per_frame or right.per_frame
+    per_pixel = left.per_pixel or right.per_pixel
+    if left.is_constant and right.is_constant:
+        return _constant(op(left.constant, right.constant))
+
+    evaluate_left = left.evaluate
+    evaluate_right = right.evaluate
+
+    if left.per_pixel and right.per_pixel:
+        def evaluate(ctx: _FrameContext) -> object:
+            return list(map(op, evaluate_left(ctx), evaluate_right(ctx)))
+    elif left.per_pixel:
+        def evaluate(ctx: _FrameContext) -> object:
+            return list(map(op, evaluate_left(ctx), repeat(evaluate_right(ctx))))
+    elif right.per_pixel:
+        def evaluate(ctx: _FrameContext) -> object:
+            a = evaluate_left(ctx)
+            return list(map(op, repeat(a), evaluate_right(ctx)))
+    else:
+        def evaluate(ctx: _FrameContext) -> object:
+            return op(evaluate_left(ctx), evaluate_right(ctx))
+
+    return _Compiled(evaluate, per_frame=per_frame, per_pixel=per_pixel)
+
+
+def _compile_unary(op: Callable, operand: _Compiled) -> _Compiled:
+    if operand.is_constant:
+        return _constant(op(operand.constant))
+
+    evaluate_operand = operand.evaluate
+    if operand.per_pixel:
+        def evaluate(ctx: _FrameContext) -> object:
+            return list(map(op, evaluate_operand(ctx)))
+    else:
+        def evaluate(ctx: _FrameContext) -> object:
+            return op(evaluate_operand(ctx))
+
+    return _Compiled(evaluate, per_frame=operand.per_frame, per_pixel=operand.per_pixel)
+
+
+def _compile_clamp(value: _Compiled, lo: float, hi: float) -> _Compiled:
+    if value.is_constant:
+        return _constant(max(lo, min(hi, value.constant)))
+
+    evaluate_value = value.evaluate
+    if value.per_pixel:
+        def evaluate(ctx: _FrameContext) -> object:
+            return list(map(max, repeat(lo), map(min, repeat(hi), evaluate_value(ctx))))
+    else:
+        def evaluate(ctx: _FrameContext) -> object:
+            return max(lo, min(hi, evaluate_value(ctx)))
+
+    return _Compiled(evaluate, per_frame=value.per_frame, per_pixel=value.per_pixel)
+
+
+def _compile_hsv(h: _Compiled, s: _Compiled, v: _Compiled) -> _Compiled:
+    per_frame = h.per_frame or s.per_frame or v.per_frame
+    per_pixel = h.per_pixel or s.per_pixel or v.per_pixel
+    hsv_to_rgb = colorsys.hsv_to_rgb
+
+    if not per_pixel:
+        def evaluate(ctx: _FrameContext) -> object:
+            r, g, b = hsv_to_rgb(h.evaluate(ctx), s.evaluate(ctx), v.evaluate(ctx))
+            return (int(r * 255), int(g * 255), int(b * 255))
+    else:
+        def evaluate(ctx: _FrameContext) -> object:
+            rgb = list(
+                map(hsv_to_rgb, _column(h.evaluate(ctx)), _column(s.evaluate(ctx)), _column(v.evaluate(ctx)))
+            )
+            return (
+                [int(c[0] * 255) for c in rgb],
+                [int(c[1] * 255) for c in rgb],
+                [int(c[2] * 255) for c in rgb],
+            )
+
+    if not per_frame and not per_pixel:
+        return _constant(evaluate(None))
+    return _Compiled(evaluate, per_frame=per_frame, per_pixel=per_pixel)
+
+
+def _compile_blend(base: _Compiled, overlay: _Compiled, alpha: _Compiled) -> _Compiled:
+    per_frame = base.per_frame or overlay.per_frame or alpha.per_frame
+    per_pixel = base.per_pixel or overlay.per_pixel or alpha.per_pixel
+    add = operator.add
+    mul = operator.mul
+
+    if not per_pixel:
+        def evaluate(ctx: _FrameContext) -> object:
+            a = alpha.evaluate(ctx)
+            inv = 1.0 - a
+            return tuple(
+                int(b * inv + o * a) for b, o in zip(base.evaluate(ctx), overlay.evaluate(ctx))
+            )
+    else:
+        def evaluate(ctx: _FrameContext) -> object:
+            a = alpha.evaluate(ctx)
+            inv = [1.0 - x for x in a] if type(a) is list else 1.0 - a
+            a_column = _column(a)
+            inv_column = _column(inv)
+            return tuple(
+                list(map(int, map(add, map(mul, _column(b), inv_column), map(mul, _column(o), a_column))))
+                for b, o in zip(base.evaluate(ctx), overlay.evaluate(ctx))
+            )
+
+    if not per_frame and not per_pixel:
+        return _constant(evaluate(None))
+    return _Compiled(evaluate, per_frame=per_frame, per_pixel=per_pixel)
@@ -0,0 +1,185 @@
+from dataclasses import dataclass
+
+from .common import RGB
+
+
+class Signal:
+    def __add__(self, other: "Operand") -> "Signal":
+        return Binary("add", self, as_signal(other))
+
+    def __radd__(self, other: "Operand") -> "Signal":
+        return Binary("add", as_signal(other), self)
+
+    def __sub__(self, other: "Operand") -> "Signal":
+        return Binary("sub", self, as_signal(other))
+
+    def __rsub__(self, other: "Operand") -> "Signal":
+        return Binary("sub", as_signal(other), self)
+
+    def __mul__(self, other: "Operand") -> "Signal":
+        return Binary("mul", self, as_signal(other))
+
+    def __rmul__(self, other: "Operand") -> "Signal":
+        return Binary("mul", as_signal(other), self)
+
+    def __truediv__(self, other: "Operand") -> "Signal":
+        return Binary("div", self, as_signal(other))
+
+    def __rtruediv__(self, other: "Operand") -> "Signal":
+        return Binary("div", as_signal(other), self)
+
+    def __mod__(self, other: "Operand") -> "Signal":
+        return Binary("mod", self, as_signal(other))
+
+    def __pow__(self, other: "Operand") -> "Signal":
+        return Binary("pow", self, as_signal(other))
+
+    def __neg__(self) -> "Signal":
+        return Unary("neg", self)
+
+
+Operand = Signal | float | int
+
+
+@dataclass(frozen=True, eq=False)
+class Const(Signal):
+    value: float
+
+    # Keep 1 and 1.0 distinct so shared-subexpression merging never changes int/float arithmetic.
+    def __eq__(self, other: object) -> bool:
+        return (
+            type(other) is Const
+            and type(self.value) is type(other.value)
+            and self.value == other.value
+        )
+
+    def __hash__(self) -> int:
+        return hash((type(self.value), self.value))
+
+
+@dataclass(frozen=True)
+class FrameCounter(Signal):
+    pass
+
+
+@dataclass(frozen=True)
+class PixelIndex(Signal):
+    pass
+
+
+@dataclass(frozen=True)
+class PixelCount(Signal):
+    pass
+
+
+@dataclass(frozen=True)
+class Binary(Signal):
+    op: str
+    left: Signal
+    right: Signal
+
+
+@dataclass(frozen=True)
+class Unary(Signal):
+    op: str
+    operand: Signal
+
+
+@dataclass(frozen=True)
+class Clamp(Signal):
+    value: Signal
+    lo: float
+    hi: float
+
+
+class Color:
+    pass
+
+
+@dataclass(frozen=True)
+class Solid(Color):
+    rgb: RGB
+
+
+@dataclass(frozen=True)
+class Hsv(Color):
+    h: Signal
+    s: Signal
+    v: Signal
+
+
+@dataclass(frozen=True)
+class Blend(Color):
+    base: Color
+    overlay: Color
+    alpha: Signal
+
+
+@dataclass(frozen=True)
+class Detail(Color):
+    full: Color
+    reduced: Color
+
+
+@dataclass(frozen=True)
+class PatternDescription:
+    name: str
+    color: Color
+
+
+FRAME = FrameCounter()
+INDEX = PixelIndex()
+PIXEL_COUNT = PixelCount()
+
+
+def as_signal(value: Operand) -> Signal:
+    if isinstance(value, Signal):
+        return value
+    return Const(value)
+
+
+def sin(x: Operand) -> Signal:
+    return Unary("sin", as_signal(x))
+
+
+def exp(x: Operand) -> Signal:
+    return Unary("exp", as_signal(x))
+
+
+def to_int(x: Operand) -> Signal:
+    return Unary("int", as_signal(x))
+
+
+def round_int(x: Operand) -> Signal:
+    return Unary("round", as_signal(x))
+
+
+def maximum(a: Operand, b: Operand) -> Signal:
+    return Binary("max", as_signal(a), as_signal(b))
+
+
+def clamp(x: Operand, lo: float, hi: float) -> Signal:
+    return Clamp(as_signal(x), lo, hi)
+
+
+def pulse(x: Operand) -> Signal:
+    return 0.5 + 0.5 * sin(x)
+
+
+def hsv(h: Operand, s: Operand, v: Operand) -> Hsv:
+    return Hsv(as_signal(h), as_signal(s), as_signal(v))
+
+
+def blend(base: Color | RGB, overlay: Color | RGB, alpha: Operand) -> Blend:
+    return Blend(_as_color(base), _as_color(overlay), as_signal(alpha))
+
+
+def detail(full: Color | RGB, reduced: Color | RGB) -> Detail:
+    # Layers under detail() are dropped for `reduced` at the cheaper quality levels.
+    return Detail(_as_color(full), _as_color(reduced))
+
+
+def _as_color(value: Color | RGB) -> Color:
+    if isinstance(value, Color):
+        return value
+    return Solid(value)
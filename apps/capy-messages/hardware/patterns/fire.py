@@ -1,7 +1,11 @@
 import math
 import random
+from functools import lru_cache
 
-from .common import RGB, clamp
+from backgrounds import FIRE_PATTERN
+
+from .common import RGB, clamp, pack_rgb
+from .registry import PatternSpec, register_pattern
 
 
 def _heat_to_fire_rgb(heat: float) -> RGB:
@@ -19,19 +23,33 @@ def _heat_to_fire_rgb(heat: float) -> RGB:
     return (int(240 + 15 * t), int(28 + 42 * t), int(4 + 12 * t))
 
 
+@lru_cache(maxsize=4)
+def _turbulence_terms(pixel_count: int) -> tuple[tuple[float, float], ...]:
+    return tuple((i * 1.23, i * 0.77) for i in range(pixel_count))
+
+
 class FirePattern:
     def __init__(self, pixel_count: int, rng: random.Random | None = None) -> None:
         self._rng = rng if rng is not None else random.Random()
         self._heat = [self._rng.uniform(0.02, 0.15) for _ in range(pixel_count)]
+        self._turbulence = True
 
     def reset(self) -> None:
         for i in range(len(self._heat)):
             self._heat[i] = self._rng.uniform(0.02, 0.15)
 
-    def render(self, frame: int) -> list[RGB]:
+    def evict(self) -> None:
+        return
+
+    def set_quality(self, quality: int) -> None:
+        # The per-pixel sine turbulence is the costly layer; cooling, diffusion and
+        # sparks still keep the flame moving without it.
+        self._turbulence = quality == 0
+
+    def render(self, frame: int) -> bytearray:
         n = len(self._heat)
         if n == 0:
-            return []
+            return bytearray()
 
         # Random cooling keeps each pixel flickering independently.
         for i in range(n):
@@ -62,11 +80,16 @@ class FirePattern:
                     1.0,
                 )
 
-        for i in range(n):
-            turbulence = 0.06 * math.sin(frame * 0.25 + i * 1.23) + 0.04 * math.sin(
-                frame * 0.16 - i * 0.77
-            )
-            ember_flicker = self._rng.uniform(-0.04, 0.07)
-            self._heat[i] = clamp(self._heat[i] + turbulence + ember_flicker, 0.0, 1.0)
+        if self._turbulence:
+            fast_t = frame * 0.25
+            slow_t = frame * 0.16
+            for i, (fast_i, slow_i) in enumerate(_turbulence_terms(n)):
+                turbulence = 0.06 * math.sin(fast_t + fast_i) + 0.04 * math.sin(slow_t - slow_i)
+                ember_flicker = self._rng.uniform(-0.04, 0.07)
+                self._heat[i] = clamp(self._heat[i] + turbulence + ember_flicker, 0.0, 1.0)
+
+        return pack_rgb([_heat_to_fire_rgb(heat) for heat in self._heat])
+
 
-        return [_heat_to_fire_rgb(heat) for heat in self._heat]
+# Heat diffuses between neighbouring LEDs, so a stretched shorter strip would look like a different fire.
+register_pattern(PatternSpec(name=FIRE_PATTERN, factory=FirePattern, sharp=True))
@@ -1,20 +1,18 @@
-import colorsys
-import math
+from backgrounds import FRANCES_PATTERN
 
-from .common import RGB, clamp
+from .dsl import FRAME, INDEX, PatternDescription, clamp, hsv, pulse, sin
+from .registry import register_description
 
+_phase = FRAME * 0.16 + INDEX * 0.72
 
-def render_frances_frame(pixel_count: int, frame: int) -> list[RGB]:
-    colors: list[RGB] = []
-    for i in range(pixel_count):
-        phase = frame * 0.16 + i * 0.72
-        hue = 0.30 + 0.045 * math.sin(phase) + 0.02 * math.sin(frame * 0.05 + i * 1.1)
-        sat = 0.72 + 0.18 * (0.5 + 0.5 * math.sin(phase * 0.8 + 1.7))
-        val = 0.34 + 0.58 * (0.5 + 0.5 * math.sin(frame * 0.10 + i * 0.95))
-        r, g, b = colorsys.hsv_to_rgb(
-            clamp(hue, 0.24, 0.40),
-            clamp(sat, 0.58, 0.96),
-            clamp(val, 0.20, 1.0),
-        )
-        colors.append((int(r * 255), int(g * 255), int(b * 255)))
-    return colors
+FRANCES = PatternDescription(
+    name=FRANCES_PATTERN,
+    color=hsv(
+        clamp(0.30 + 0.045 * sin(_phase) + 0.02 * sin(FRAME * 0.05 + INDEX * 1.1), 0.24, 0.40),
+        clamp(0.72 + 0.18 * pulse(_phase * 0.8 + 1.7), 0.58, 0.96),
+        clamp(0.34 + 0.58 * pulse(FRAME * 0.10 + INDEX * 0.95), 0.20, 1.0),
+    ),
+)
+
+# Hue and value ripple with a period of under ten LEDs.
+register_description(FRANCES, sharp=True)
@@ -1,69 +1,71 @@
-import colorsys
-import math
+from backgrounds import NIGHT_PATTERN
 
-from .common import RGB, blend_rgb, clamp
+from .dsl import (
+    FRAME,
+    INDEX,
+    PIXEL_COUNT,
+    PatternDescription,
+    blend,
+    clamp,
+    detail,
+    exp,
+    hsv,
+    maximum,
+    pulse,
+    sin,
+)
+from .registry import register_description
 
+_breathe = pulse(FRAME * 0.024 + INDEX * 0.23)
+_base = hsv(
+    clamp(0.625 + 0.01 * sin(FRAME * 0.02 + INDEX * 0.13), 0.58, 0.67),
+    clamp(0.80 + 0.08 * _breathe, 0.74, 0.92),
+    clamp(0.055 + 0.06 * _breathe, 0.04, 0.13),
+)
 
-def render_night_frame(pixel_count: int, frame: int) -> list[RGB]:
-    if pixel_count <= 0:
-        return []
+_glow_center = 2.35 + 0.18 * sin(FRAME * 0.018)
+_glow_sigma = maximum(1.0, PIXEL_COUNT * 0.14)
+_glow_dist = INDEX - _glow_center
+_glow_strength = exp(-(_glow_dist * _glow_dist) / (2.0 * _glow_sigma * _glow_sigma))
+_glow_pulse = pulse(FRAME * 0.05 + INDEX * 0.2)
 
-    colors: list[RGB] = []
+_ember_orange = hsv(
+    clamp(0.056 + 0.004 * sin(FRAME * 0.03 + INDEX * 0.35), 0.048, 0.065),
+    clamp(0.94, 0.88, 1.0),
+    clamp(0.30 + 0.08 * _glow_pulse, 0.24, 0.44),
+)
+_ember_base = blend(_base, _ember_orange, clamp(_glow_strength * (0.12 + 0.16 * _glow_pulse), 0.0, 0.30))
 
-    # Keep the sparkle hotspot centered around LEDs 2..4 with slight drift.
-    twinkle_center = 2.0 + 0.35 * math.sin(frame * 0.028)
-    twinkle_sigma = max(1.1, pixel_count * 0.16)
-    glow_center = 2.35 + 0.18 * math.sin(frame * 0.018)
-    glow_sigma = max(1.0, pixel_count * 0.14)
+# Keep the sparkle hotspot centered around LEDs 2..4 with slight drift.
+_twinkle_center = 2.0 + 0.35 * sin(FRAME * 0.028)
+_twinkle_sigma = maximum(1.1, PIXEL_COUNT * 0.16)
+_twinkle_dist = INDEX - _twinkle_center
+_hotspot_strength = exp(-(_twinkle_dist * _twinkle_dist) / (2.0 * _twinkle_sigma * _twinkle_sigma))
 
-    for i in range(pixel_count):
-        breathe = 0.5 + 0.5 * math.sin(frame * 0.024 + i * 0.23)
-        base_h = 0.625 + 0.01 * math.sin(frame * 0.02 + i * 0.13)
-        base_s = 0.80 + 0.08 * breathe
-        base_v = 0.055 + 0.06 * breathe
-        base = _hsv_to_rgb(
-            clamp(base_h, 0.58, 0.67),
-            clamp(base_s, 0.74, 0.92),
-            clamp(base_v, 0.04, 0.13),
-        )
+_shimmer = pulse(FRAME * 0.29 + INDEX * 1.21)
+_micro = pulse(FRAME * 0.41 - INDEX * 1.77)
+_sparkle = clamp(_shimmer * _micro, 0.0, 1.0) ** 3.2
 
-        glow_dist = i - glow_center
-        glow_strength = math.exp(-(glow_dist * glow_dist) / (2.0 * glow_sigma * glow_sigma))
-        glow_pulse = 0.5 + 0.5 * math.sin(frame * 0.05 + i * 0.2)
+_sunset_orange = hsv(
+    clamp(0.070 + 0.010 * sin(FRAME * 0.12 + INDEX * 0.7), 0.05, 0.10),
+    clamp(0.82 + 0.14 * _shimmer, 0.74, 1.0),
+    clamp(0.35 + 0.62 * _sparkle, 0.26, 1.0),
+)
 
-        ember_h = 0.056 + 0.004 * math.sin(frame * 0.03 + i * 0.35)
-        ember_s = 0.94
-        ember_v = 0.30 + 0.08 * glow_pulse
-        ember_orange = _hsv_to_rgb(
-            clamp(ember_h, 0.048, 0.065),
-            clamp(ember_s, 0.88, 1.0),
-            clamp(ember_v, 0.24, 0.44),
-        )
-        glow_alpha = clamp(glow_strength * (0.12 + 0.16 * glow_pulse), 0.0, 0.30)
-        ember_base = blend_rgb(base, ember_orange, glow_alpha)
+# Cheaper levels drop the sparkle and the ember HSV for a flat ember glow.
+_reduced = blend(_base, (87, 33, 5), clamp(_glow_strength * 0.20, 0.0, 0.30))
 
-        dist = i - twinkle_center
-        hotspot_strength = math.exp(-(dist * dist) / (2.0 * twinkle_sigma * twinkle_sigma))
+NIGHT = PatternDescription(
+    name=NIGHT_PATTERN,
+    color=detail(
+        blend(
+            _ember_base,
+            _sunset_orange,
+            clamp(_hotspot_strength * (0.08 + 0.72 * _sparkle), 0.0, 0.86),
+        ),
+        _reduced,
+    ),
+)
 
-        shimmer = 0.5 + 0.5 * math.sin(frame * 0.29 + i * 1.21)
-        micro = 0.5 + 0.5 * math.sin(frame * 0.41 - i * 1.77)
-        sparkle = clamp(shimmer * micro, 0.0, 1.0) ** 3.2
-
-        orange_h = 0.070 + 0.010 * math.sin(frame * 0.12 + i * 0.7)
-        orange_s = 0.82 + 0.14 * shimmer
-        orange_v = 0.35 + 0.62 * sparkle
-        sunset_orange = _hsv_to_rgb(
-            clamp(orange_h, 0.05, 0.10),
-            clamp(orange_s, 0.74, 1.0),
-            clamp(orange_v, 0.26, 1.0),
-        )
-
-        orange_alpha = clamp(hotspot_strength * (0.08 + 0.72 * sparkle), 0.0, 0.86)
-        colors.append(blend_rgb(ember_base, sunset_orange, orange_alpha))
-
-    return colors
-
-
-def _hsv_to_rgb(h: float, s: float, v: float) -> RGB:
-    r, g, b = colorsys.hsv_to_rgb(h, s, v)
-    return (int(r * 255), int(g * 255), int(b * 255))
+# Sparkle and breathing terms repeat every few LEDs, so control points would alias them.
+register_description(NIGHT, sharp=True)
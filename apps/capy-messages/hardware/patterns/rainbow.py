@@ -1,14 +1,15 @@
-import colorsys
-import math
+from backgrounds import RAINBOW_PATTERN
 
-from .common import RGB, clamp
+from .dsl import FRAME, INDEX, PatternDescription, clamp, hsv, pulse, sin, to_int
+from .registry import register_description
 
+_hue = (FRAME * 4 + INDEX * 24 + to_int(16 * sin(FRAME * 0.10 + INDEX * 0.65))) % 256
+_brightness = 0.5 + 0.4 * pulse(FRAME * 0.08 + INDEX * 0.50)
 
-def render_rainbow_frame(pixel_count: int, frame: int) -> list[RGB]:
-    colors: list[RGB] = []
-    for i in range(pixel_count):
-        hue = (frame * 4 + i * 24 + int(16 * math.sin(frame * 0.10 + i * 0.65))) % 256
-        brightness = 0.5 + 0.4 * (0.5 + 0.5 * math.sin(frame * 0.08 + i * 0.50))
-        r, g, b = colorsys.hsv_to_rgb(hue / 255.0, 1.0, clamp(brightness, 0.0, 1.0))
-        colors.append((int(r * 255), int(g * 255), int(b * 255)))
-    return colors
+RAINBOW = PatternDescription(
+    name=RAINBOW_PATTERN,
+    color=hsv(_hue / 255.0, 1.0, clamp(_brightness, 0.0, 1.0)),
+)
+
+# The hue wraps every few LEDs; interpolating across the wrap paints false colors.
+register_description(RAINBOW, sharp=True)
@@ -0,0 +1,111 @@
+import importlib
+import pkgutil
+import random
+from dataclasses import dataclass
+from typing import Callable, Protocol
+
+from backgrounds import DEFAULT_PATTERN, pattern_for_background
+
+from .compiler import SignalPattern, compile_pattern
+from .dsl import PatternDescription
+
+
+class PatternSource(Protocol):
+    def render(self, frame: int) -> bytes:
+        ...
+
+    def reset(self) -> None:
+        ...
+
+    def evict(self) -> None:
+        ...
+
+    def set_quality(self, quality: int) -> None:
+        ...
+
+
+PatternFactory = Callable[[int, random.Random], PatternSource]
+# (pixel_count, rng, control_points) for sources that evaluate at control points themselves.
+UpsampledPatternFactory = Callable[[int, random.Random, int], PatternSource]
+
+
+@dataclass(frozen=True)
+class PatternSpec:
+    name: str
+    factory: PatternFactory
+    smoothed: bool = True
+    background_ids: tuple[str, ...] = ()
+    # Per-pixel detail that interpolation would smear; always rendered at full resolution.
+    sharp: bool = False
+    upsampled_factory: UpsampledPatternFactory | None = None
+
+
+class Pattern:
+    def __init__(self, spec: PatternSpec, source: PatternSource) -> None:
+        self.spec = spec
+        self.name = spec.name
+        self.smoothed = spec.smoothed
+        self.render = source.render
+        self.reset = source.reset
+        self.evict = source.evict
+        self.set_quality = source.set_quality
+
+
+_PATTERNS: dict[str, PatternSpec] = {}
+_BACKGROUND_BINDINGS: dict[str, str] = {}
+_discovered = False
+
+
+def register_pattern(spec: PatternSpec) -> PatternSpec:
+    if spec.name in _PATTERNS:
+        raise ValueError(f"Pattern '{spec.name}' is already registered.")
+
+    _PATTERNS[spec.name] = spec
+    for background_id in spec.background_ids:
+        _BACKGROUND_BINDINGS[background_id] = spec.name
+    return spec
+
+
+def register_description(description: PatternDescription, **options) -> PatternSpec:
+    sharp = options.get("sharp", False)
+
+    def build(pixel_count: int, rng: random.Random, control_points: int = 0) -> SignalPattern:
+        return SignalPattern(compile_pattern(description), pixel_count, control_points, sharp)
+
+    return register_pattern(
+        PatternSpec(name=description.name, factory=build, upsampled_factory=build, **options)
+    )
+
+
+def registered_patterns() -> dict[str, PatternSpec]:
+    _discover_patterns()
+    return dict(_PATTERNS)
+
+
+def build_pattern(name: str, pixel_count: int, rng: random.Random, control_points: int = 0) -> Pattern:
+    _discover_patterns()
+    spec = _PATTERNS.get(name) or _PATTERNS[DEFAULT_PATTERN]
+    if spec.sharp or spec.upsampled_factory is None or control_points < 2 or control_points >= pixel_count:
+        return Pattern(spec, spec.factory(pixel_count, rng))
+
+    # Compiled patterns keep INDEX/PIXEL_COUNT in physical pixels and only sample fewer of them.
+    return Pattern(spec, spec.upsampled_factory(pixel_count, rng, control_points))
+
+
+def pattern_name_for_background(background_id: str) -> str:
+    _discover_patterns()
+    name = _BACKGROUND_BINDINGS.get(background_id) or pattern_for_background(background_id)
+    return name if name in _PATTERNS else DEFAULT_PATTERN
+
+
+def _discover_patterns() -> None:
+    global _discovered
+    if _discovered:
+        return
+    _discovered = True
+
+    # Every module in this package registers its own patterns on import, so a new
+    # pattern only needs a new module.
+    package = importlib.import_module(__package__)
+    for module in pkgutil.iter_modules(package.__path__):
+        importlib.import_module(f"{__package__}.{module.name}")
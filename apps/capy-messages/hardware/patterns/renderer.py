@@ -1,81 +1,131 @@
 import random
+import time
 
-from backgrounds import (
-    ADEL_PATTERN,
-    BEACH_PATTERN,
-    FIRE_PATTERN,
-    FRANCES_PATTERN,
-    NIGHT_PATTERN,
-    SLEEP_PATTERN,
-    TAN_BROWN_PATTERN,
-    TRANQUIL_PATTERN,
-)
-
-from .adel import render_adel_frame
-from .beach import render_beach_frame
-from .common import RGB, blend_rgb
-from .fire import FirePattern
-from .frances import render_frances_frame
-from .night import render_night_frame
-from .rainbow import render_rainbow_frame
-from .sleep import render_sleep_frame
-from .tan_brown import render_tan_brown_frame
-from .tranquil import render_tranquil_frame
+from backgrounds import DEFAULT_BACKGROUND_ID
+from instrumentation import INSTRUMENTS
+
+from .registry import Pattern, build_pattern, pattern_name_for_background
+from .transition import Crossfade
 
 
 class PatternRenderer:
-    def __init__(self, pixel_count: int) -> None:
+    def __init__(self, pixel_count: int, transition_frames: int = 0, control_points: int = 0) -> None:
         self._pixel_count = pixel_count
+        self._control_points = control_points
         self._rng = random.Random()
-        self._fire_pattern = FirePattern(pixel_count, self._rng)
-        self._last_pattern = ""
-        self._smoothed_colors: list[RGB] = [(0, 0, 0)] * pixel_count
+        self._patterns: dict[str, Pattern] = {}
+        self._active: Pattern | None = None
+        self._background_id: str | None = None
+        self._last_target_frame: bytes = b""
+        self._crossfade = Crossfade(transition_frames)
+        self._outgoing_pattern: Pattern | None = None
+        self._outgoing_frame: bytes | None = None
+        self._transition_step = 0
+        self._smoothed_frame = bytearray(pixel_count * 3)
         self._color_smoothing_alpha = 0.42
+        self._quality = 0
+
+    @property
+    def active_pattern(self) -> Pattern | None:
+        return self._active
+
+    def select(self, background_id: str) -> Pattern:
+        if background_id == self._background_id and self._active is not None:
+            return self._active
+
+        self._background_id = background_id
+        pattern = self._resolve(pattern_name_for_background(background_id))
+        if pattern is not self._active:
+            self._begin_transition(pattern)
+        return pattern
+
+    def set_quality(self, quality: int) -> None:
+        if quality == self._quality:
+            return
+        self._quality = quality
+        for pattern in self._patterns.values():
+            pattern.set_quality(quality)
+
+    def render(self, frame: int) -> bytes:
+        pattern = self._active
+        if pattern is None:
+            pattern = self.select(DEFAULT_BACKGROUND_ID)
+
+        started_at = time.perf_counter()
+        target_frame = pattern.render(frame)
+        if self._outgoing_pattern is not None or self._outgoing_frame is not None:
+            target_frame = self._advance_transition(target_frame, frame)
+        self._last_target_frame = target_frame
+        rendered_at = time.perf_counter()
+        INSTRUMENTS.observe("pattern", rendered_at - started_at)
+
+        if not pattern.smoothed:
+            self._smoothed_frame = bytearray(target_frame)
+            return bytes(target_frame)
+
+        smoothed = self._smooth_frame(target_frame)
+        INSTRUMENTS.observe("smooth", time.perf_counter() - rendered_at)
+        return smoothed
+
+    def close(self) -> None:
+        return
+
+    def _resolve(self, name: str) -> Pattern:
+        pattern = self._patterns.get(name)
+        if pattern is None:
+            pattern = build_pattern(name, self._pixel_count, self._rng, self._control_points)
+            pattern.set_quality(self._quality)
+            self._patterns[name] = pattern
+        return pattern
+
+    def _begin_transition(self, pattern: Pattern) -> None:
+        previous = self._active
+        self._active = pattern
+        pattern.reset()
+
+        if previous is None or self._crossfade.frames == 0 or not self._last_target_frame:
+            return
+
+        if self._outgoing_pattern is not None or self._outgoing_frame is not None:
+            # Switching mid-blend freezes what is on the strip instead of rendering a
+            # third pattern, so a blend never costs more than two renders per frame.
+            self._evict(self._outgoing_pattern)
+            self._evict(previous)
+            self._outgoing_pattern = None
+            self._outgoing_frame = self._last_target_frame
+        else:
+            self._outgoing_pattern = previous
+            self._outgoing_frame = None
+        self._transition_step = 0
 
-    def render(
-        self,
-        pattern: str,
-        frame: int,
-    ) -> list[RGB]:
-        if pattern != self._last_pattern:
-            if pattern == FIRE_PATTERN:
-                self._fire_pattern.reset()
-            self._last_pattern = pattern
-
-        if pattern == FIRE_PATTERN:
-            target_colors = self._fire_pattern.render(frame)
-        elif pattern == ADEL_PATTERN:
-            # Intentionally bypass smoothing so this mode can flash at max frame rate.
-            target_colors = render_adel_frame(self._pixel_count, self._rng)
-            self._smoothed_colors = target_colors.copy()
-            return target_colors
-        elif pattern == TAN_BROWN_PATTERN:
-            target_colors = render_tan_brown_frame(self._pixel_count, frame)
-        elif pattern == BEACH_PATTERN:
-            target_colors = render_beach_frame(self._pixel_count, frame)
-        elif pattern == FRANCES_PATTERN:
-            target_colors = render_frances_frame(self._pixel_count, frame)
-        elif pattern == SLEEP_PATTERN:
-            target_colors = render_sleep_frame(self._pixel_count, frame)
-        elif pattern == NIGHT_PATTERN:
-            target_colors = render_night_frame(self._pixel_count, frame)
-        elif pattern == TRANQUIL_PATTERN:
-            target_colors = render_tranquil_frame(self._pixel_count, frame)
+    def _advance_transition(self, incoming: bytes, frame: int) -> bytes:
+        if self._outgoing_frame is not None:
+            outgoing = self._outgoing_frame
         else:
-            target_colors = render_rainbow_frame(self._pixel_count, frame)
+            outgoing = self._outgoing_pattern.render(frame)
 
-        return self._smooth_colors(target_colors)
+        mixed = self._crossfade.mix(outgoing, incoming, self._transition_step)
+        self._transition_step += 1
+        if self._transition_step >= self._crossfade.frames:
+            self._evict(self._outgoing_pattern)
+            self._outgoing_pattern = None
+            self._outgoing_frame = None
+        return mixed
 
-    def _smooth_colors(self, target_colors: list[RGB]) -> list[RGB]:
-        if len(self._smoothed_colors) != len(target_colors):
-            self._smoothed_colors = target_colors.copy()
-            return self._smoothed_colors.copy()
+    def _evict(self, pattern: Pattern | None) -> None:
+        if pattern is None or pattern is self._active:
+            return
+        pattern.evict()
 
-        smoothed: list[RGB] = []
-        for i, target in enumerate(target_colors):
-            previous = self._smoothed_colors[i]
-            smoothed_color = blend_rgb(previous, target, self._color_smoothing_alpha)
-            smoothed.append(smoothed_color)
+    def _smooth_frame(self, target_frame: bytes) -> bytes:
+        if len(self._smoothed_frame) != len(target_frame):
+            self._smoothed_frame = bytearray(target_frame)
+            return bytes(target_frame)
 
-        self._smoothed_colors = smoothed
-        return smoothed.copy()
+        # Per-channel EMA on the packed buffer; matches blend_rgb truncation.
+        alpha = self._color_smoothing_alpha
+        inv = 1.0 - alpha
+        self._smoothed_frame = bytearray(
+            [int(previous * inv + target * alpha) for previous, target in zip(self._smoothed_frame, target_frame)]
+        )
+        return bytes(self._smoothed_frame)
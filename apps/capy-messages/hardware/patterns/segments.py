@@ -0,0 +1,207 @@
+import multiprocessing
+from multiprocessing.connection import Connection
+from typing import Sequence
+
+from config import SegmentConfig
+
+from .renderer import PatternRenderer
+
+# (pixel_count, fixed background id or None to follow the global background)
+RenderJob = tuple[int, str | None]
+
+
+class _InlineRenderWorker:
+    def __init__(self, jobs: Sequence[RenderJob], transition_frames: int, control_points: int) -> None:
+        self._renderers = _build_renderers(jobs, transition_frames, control_points)
+        self._frame = 0
+
+    def select(self, background_id: str) -> None:
+        _select(self._renderers, background_id)
+
+    def set_quality(self, quality: int) -> None:
+        for renderer, _ in self._renderers:
+            renderer.set_quality(quality)
+
+    def start_render(self, frame: int) -> None:
+        self._frame = frame
+
+    def collect(self) -> list[bytes]:
+        return [renderer.render(self._frame) for renderer, _ in self._renderers]
+
+    def close(self) -> None:
+        return
+
+
+class _ProcessRenderWorker:
+    def __init__(self, jobs: Sequence[RenderJob], transition_frames: int, control_points: int) -> None:
+        # Workers are forked at startup, before the daemon starts its other threads.
+        context = multiprocessing.get_context("fork")
+        self._job_count = len(jobs)
+        self._conn, child_conn = context.Pipe()
+        self._process = context.Process(
+            target=_run_render_worker,
+            args=(child_conn, list(jobs), transition_frames, control_points),
+            name="segment-render",
+            daemon=True,
+        )
+        self._process.start()
+        child_conn.close()
+
+    def select(self, background_id: str) -> None:
+        self._conn.send(("select", background_id))
+
+    def set_quality(self, quality: int) -> None:
+        self._conn.send(("quality", quality))
+
+    def start_render(self, frame: int) -> None:
+        self._conn.send(("render", frame))
+
+    def collect(self) -> list[bytes]:
+        return [self._conn.recv_bytes() for _ in range(self._job_count)]
+
+    def close(self) -> None:
+        try:
+            self._conn.send(None)
+        except OSError:
+            pass
+        self._process.join(timeout=1.0)
+
+
+class SegmentedRenderer:
+    def __init__(
+        self,
+        segments: Sequence[SegmentConfig],
+        transition_frames: int = 0,
+        workers: int = 0,
+        control_points: int = 0,
+    ) -> None:
+        jobs: list[RenderJob] = []
+        # Each segment maps to (job index, first byte, last byte) in that job's frame.
+        self._layout: list[tuple[int, int, int]] = []
+
+        shared = [segment for segment in segments if segment.background_id is None]
+        if shared:
+            jobs.append((max(segment.offset + segment.output.count for segment in shared), None))
+
+        for segment in segments:
+            count = segment.output.count
+            if segment.background_id is None:
+                self._layout.append((0, segment.offset * 3, (segment.offset + count) * 3))
+            else:
+                jobs.append((count, segment.background_id))
+                self._layout.append((len(jobs) - 1, 0, count * 3))
+
+        self._frame_size = sum(segment.output.count for segment in segments) * 3
+
+        # Jobs are spread round-robin over render processes so pattern math uses several
+        # cores; with no workers everything renders inline in the caller's thread.
+        self._worker_jobs: list[list[int]] = []
+        self._workers: list[_InlineRenderWorker | _ProcessRenderWorker] = []
+        if workers <= 0:
+            self._worker_jobs.append(list(range(len(jobs))))
+            self._workers.append(_InlineRenderWorker(jobs, transition_frames, control_points))
+        else:
+            for worker_index in range(min(workers, len(jobs))):
+                job_indexes = list(range(worker_index, len(jobs), workers))
+                self._worker_jobs.append(job_indexes)
+                self._workers.append(
+                    _ProcessRenderWorker([jobs[index] for index in job_indexes], transition_frames, control_points)
+                )
+
+        self._job_frames: list[bytes] = [b""] * len(jobs)
+
+    def select(self, background_id: str) -> None:
+        for worker in self._workers:
+            worker.select(background_id)
+
+    def set_quality(self, quality: int) -> None:
+        for worker in self._workers:
+            worker.set_quality(quality)
+
+    def render(self, frame: int) -> bytes:
+        for worker in self._workers:
+            worker.start_render(frame)
+        for worker, job_indexes in zip(self._workers, self._worker_jobs):
+            for job_index, job_frame in zip(job_indexes, worker.collect()):
+                self._job_frames[job_index] = job_frame
+
+        canvas = bytearray(self._frame_size)
+        position = 0
+        for job_index, start, end in self._layout:
+            canvas[position : position + end - start] = self._job_frames[job_index][start:end]
+            position += end - start
+        return bytes(canvas)
+
+    def close(self) -> None:
+        for worker in self._workers:
+            worker.close()
+
+
+def build_segment_renderer(
+    segments: Sequence[SegmentConfig],
+    transition_frames: int = 0,
+    workers: int = 0,
+    control_points: int = 0,
+) -> PatternRenderer | SegmentedRenderer:
+    if len(segments) == 1 and segments[0].background_id is None and segments[0].offset == 0:
+        return PatternRenderer(
+            pixel_count=segments[0].output.count,
+            transition_frames=transition_frames,
+            control_points=control_points,
+        )
+    return SegmentedRenderer(
+        segments,
+        transition_frames=transition_frames,
+        workers=workers,
+        control_points=control_points,
+    )
+
+
+def _build_renderers(
+    jobs: Sequence[RenderJob],
+    transition_frames: int,
+    control_points: int,
+) -> list[tuple[PatternRenderer, str | None]]:
+    renderers: list[tuple[PatternRenderer, str | None]] = []
+    for pixel_count, background_id in jobs:
+        renderer = PatternRenderer(
+            pixel_count=pixel_count,
+            transition_frames=transition_frames,
+            control_points=control_points,
+        )
+        if background_id is not None:
+            renderer.select(background_id)
+        renderers.append((renderer, background_id))
+    return renderers
+
+
+def _select(renderers: Sequence[tuple[PatternRenderer, str | None]], background_id: str) -> None:
+    for renderer, fixed_background_id in renderers:
+        if fixed_background_id is None:
+            renderer.select(background_id)
+
+
+def _run_render_worker(
+    conn: Connection,
+    jobs: list[RenderJob],
+    transition_frames: int,
+    control_points: int,
+) -> None:
+    renderers = _build_renderers(jobs, transition_frames, control_points)
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            return
+        if message is None:
+            return
+
+        kind, value = message
+        if kind == "select":
+            _select(renderers, value)
+        elif kind == "quality":
+            for renderer, _ in renderers:
+                renderer.set_quality(value)
+        elif kind == "render":
+            for renderer, _ in renderers:
+                conn.send_bytes(renderer.render(value))
@@ -1,11 +1,29 @@
-from .common import RGB
+import random
 
+from backgrounds import TAN_BROWN_PATTERN
 
-def render_tan_brown_frame(pixel_count: int, frame: int) -> list[RGB]:
-    if pixel_count <= 0:
-        return []
+from .common import RGB, pack_rgb
+from .registry import PatternSpec, register_pattern
 
-    tan: RGB = (194, 152, 107)
-    dark_brown: RGB = (69, 42, 24)
 
-    return [tan if i % 2 == 0 else dark_brown for i in range(pixel_count)]
+class TanBrownPattern:
+    def __init__(self, pixel_count: int, rng: random.Random | None = None) -> None:
+        tan: RGB = (194, 152, 107)
+        dark_brown: RGB = (69, 42, 24)
+        self._frame = bytes(pack_rgb([tan if i % 2 == 0 else dark_brown for i in range(max(0, pixel_count))]))
+
+    def render(self, frame: int) -> bytes:
+        return self._frame
+
+    def reset(self) -> None:
+        return
+
+    def evict(self) -> None:
+        return
+
+    def set_quality(self, quality: int) -> None:
+        return
+
+
+# Alternating stripes would interpolate to a flat mid-brown.
+register_pattern(PatternSpec(name=TAN_BROWN_PATTERN, factory=TanBrownPattern, sharp=True))
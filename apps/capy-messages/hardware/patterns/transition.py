@@ -0,0 +1,22 @@
+class Crossfade:
+    def __init__(self, frames: int) -> None:
+        self.frames = max(0, frames)
+        self._tables: list[tuple[bytes, bytes]] = []
+        for step in range(1, self.frames + 1):
+            weight = (step * 256) // (self.frames + 1)
+            self._tables.append(
+                (
+                    bytes((value * (256 - weight)) >> 8 for value in range(256)),
+                    bytes((value * weight) >> 8 for value in range(256)),
+                )
+            )
+
+    def mix(self, outgoing: bytes, incoming: bytes, step: int) -> bytes:
+        outgoing_table, incoming_table = self._tables[step]
+        # Both scaled halves sum to at most 255 per channel, so adding the buffers as
+        # big integers never carries into the neighbouring byte.
+        size = len(incoming)
+        mixed = int.from_bytes(outgoing.translate(outgoing_table), "big") + int.from_bytes(
+            incoming.translate(incoming_table), "big"
+        )
+        return mixed.to_bytes(size, "big")
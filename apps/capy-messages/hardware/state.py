@@ -1,4 +1,16 @@
 import threading
+import time
+from dataclasses import dataclass, replace
+
+from instrumentation import SwitchTiming
+
+
+@dataclass(frozen=True)
+class RuntimeSnapshot:
+    version: int
+    background_id: str
+    display_active: bool
+    background_timing: SwitchTiming | None = None
 
 
 class RuntimeState:
@@ -6,13 +18,52 @@ class RuntimeState:
         self.display_active = threading.Event()
         self.shutdown = threading.Event()
 
+        # Writers serialize on the lock; readers only load the current snapshot reference.
         self._lock = threading.Lock()
-        self._background_id = initial_background_id
+        self._activity = threading.Condition(self._lock)
+        self._snapshot = RuntimeSnapshot(
+            version=0,
+            background_id=initial_background_id,
+            display_active=False,
+        )
+
+    @property
+    def snapshot(self) -> RuntimeSnapshot:
+        return self._snapshot
 
-    def set_background_id(self, background_id: str) -> None:
+    def wait_until_active(self, timeout: float | None = None) -> bool:
+        with self._activity:
+            self._activity.wait_for(
+                lambda: self._snapshot.display_active or self.shutdown.is_set(),
+                timeout=timeout,
+            )
+            return self._snapshot.display_active and not self.shutdown.is_set()
+
+    def request_shutdown(self) -> None:
+        with self._activity:
+            self.shutdown.set()
+            self._activity.notify_all()
+
+    def set_background_id(self, background_id: str, timing: SwitchTiming | None = None) -> None:
         with self._lock:
-            self._background_id = background_id
+            if background_id == self._snapshot.background_id:
+                return
+            self._publish_locked(
+                background_id=background_id,
+                background_timing=replace(timing, published_at=time.monotonic()) if timing else None,
+            )
 
-    def get_background_id(self) -> str:
+    def set_display_active(self, active: bool) -> None:
         with self._lock:
-            return self._background_id
+            if active:
+                self.display_active.set()
+            else:
+                self.display_active.clear()
+            self._publish_locked(display_active=active)
+            self._activity.notify_all()
+
+    def _publish_locked(self, **changes: object) -> None:
+        current = self._snapshot
+        if all(getattr(current, name) == value for name, value in changes.items()):
+            return
+        self._snapshot = replace(current, version=current.version + 1, **changes)
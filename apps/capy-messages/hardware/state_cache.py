@@ -0,0 +1,32 @@
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+
+@dataclass(frozen=True)
+class CachedState:
+    background_id: str
+    display_active: bool
+
+
+def load_cached_state(path: Path) -> CachedState | None:
+    try:
+        payload = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+    background_id = payload.get("backgroundId") if isinstance(payload, dict) else None
+    if not isinstance(background_id, str) or not background_id:
+        return None
+    return CachedState(background_id=background_id, display_active=bool(payload.get("displayActive")))
+
+
+def save_cached_state(path: Path, state: CachedState) -> None:
+    # Write-then-rename so a restart mid-write never reads a torn file.
+    temporary = path.with_name(f".{path.name}.tmp")
+    try:
+        temporary.write_text(json.dumps({"backgroundId": state.background_id, "displayActive": state.display_active}))
+        os.replace(temporary, path)
+    except OSError as exc:
+        print(f"State cache write failed ({path}): {exc}")
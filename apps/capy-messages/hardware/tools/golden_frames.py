@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+import argparse
+import base64
+import gzip
+import hashlib
+import io
+import json
+import random
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+HARDWARE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(HARDWARE_DIR))
+
+from patterns import MAX_QUALITY  # noqa: E402
+from patterns.registry import PatternSource, build_pattern, registered_patterns  # noqa: E402
+
+# Records reference frames for every registered pattern from the pure-Python
+# renderers at BASELINE_REVISION, then replays the same seeded frames through this
+# tree's engines (full quality, quality levels, control-point upsampling) and reports
+# how far each one drifts from the references next to how much faster it is than
+# the baseline renderers, timed in the same checkout on this machine.
+#
+# The references are a SHA-256 over every frame plus every SAMPLE_EVERY-th frame in
+# full, so exact matches are checked on all frames and drift is measured on samples.
+# Regenerate with `golden_frames.py record`.
+
+GOLDEN_PATH = Path(__file__).resolve().parent / "golden_frames.json.gz"
+BASELINE_REVISION = "f7ec3b59a3e27ac39d3254bc4434274d3a4b2441"
+PIXEL_COUNTS = (1, 7, 60, 300)
+FRAMES = 32
+SAMPLE_EVERY = 8
+SEED = 1234
+
+# adel draws each frame with one randbytes() call where the baseline called randint()
+# per channel, so the same seed gives different (equally uniform) noise; it is
+# reported but never checked.
+UNCHECKED_PATTERNS = {"adel"}
+
+# Runs inside a checkout of the reference revision, so its `patterns` package never
+# meets this one. Trees from before the pattern registry have one module per pattern
+# exposing render_<name>_frame() or FirePattern.
+_RENDER_SCRIPT = """
+import importlib
+import inspect
+import json
+import random
+import sys
+import time
+
+names, pixel_counts, frames, seed, timed_pixel_count, repeats = json.loads(sys.argv[1])
+
+
+def source(name, pixel_count, rng):
+    try:
+        from patterns.registry import build_pattern
+    except ImportError:
+        module = importlib.import_module(f"patterns.{name}")
+        if hasattr(module, "FirePattern"):
+            return module.FirePattern(pixel_count, rng).render
+        render_frame = getattr(module, f"render_{name}_frame")
+        if "rng" in inspect.signature(render_frame).parameters:
+            return lambda frame: render_frame(pixel_count, rng)
+        return lambda frame: render_frame(pixel_count, frame)
+    return build_pattern(name, pixel_count, rng).render
+
+
+def pack(colors):
+    if isinstance(colors, (bytes, bytearray)):
+        return bytes(colors)
+    return bytes(channel for rgb in colors for channel in rgb)
+
+
+rendered = {}
+for name in names:
+    rendered[name] = {}
+    for pixel_count in pixel_counts:
+        render = source(name, pixel_count, random.Random(seed))
+        rendered[name][str(pixel_count)] = [pack(render(frame)).hex() for frame in range(frames)]
+
+seconds = {}
+for name in names:
+    timings = []
+    for _ in range(repeats):
+        render = source(name, timed_pixel_count, random.Random(seed))
+        started_at = time.perf_counter()
+        for frame in range(frames):
+            pack(render(frame))
+        timings.append(time.perf_counter() - started_at)
+    if timings:
+        seconds[name] = min(timings)
+json.dump({"frames": rendered, "seconds": seconds}, sys.stdout)
+"""
+
+# (pattern name, pixel count, rng) -> source
+Engine = Callable[[str, int, random.Random], PatternSource]
+
+
+def _quality_engine(quality: int) -> Engine:
+    def build(name: str, pixel_count: int, rng: random.Random) -> PatternSource:
+        pattern = build_pattern(name, pixel_count, rng)
+        pattern.set_quality(quality)
+        return pattern
+
+    return build
+
+
+def _control_point_engine(control_points: int) -> Engine:
+    def build(name: str, pixel_count: int, rng: random.Random) -> PatternSource:
+        return build_pattern(name, pixel_count, rng, control_points)
+
+    return build
+
+
+ENGINES: dict[str, Engine] = {
+    "full": _quality_engine(0),
+    **{f"quality-{quality}": _quality_engine(quality) for quality in range(1, MAX_QUALITY + 1)},
+    "control-points-32": _control_point_engine(32),
+}
+
+
+def render_frames(engine: Engine, name: str, pixel_count: int, frames: int, seed: int) -> tuple[list[bytes], float]:
+    # fire and adel draw from the rng, so every engine replays the same sequence.
+    source = engine(name, pixel_count, random.Random(seed))
+    rendered: list[bytes] = []
+    started_at = time.perf_counter()
+    for frame in range(frames):
+        rendered.append(bytes(source.render(frame)))
+    return rendered, time.perf_counter() - started_at
+
+
+def time_engine(engine: Engine, name: str, pixel_count: int, frames: int, seed: int, repeats: int = 3) -> float:
+    return min(render_frames(engine, name, pixel_count, frames, seed)[1] for _ in range(repeats))
+
+
+def frame_digest(frames: list[bytes]) -> str:
+    return hashlib.sha256(b"".join(frames)).hexdigest()
+
+
+def render_revision(
+    revision: str,
+    names: list[str],
+    frames: int,
+    seed: int,
+    pixel_counts: tuple[int, ...] = PIXEL_COUNTS,
+    timed_pixel_count: int = 0,
+    repeats: int = 0,
+) -> tuple[dict[str, dict[str, list[bytes]]], dict[str, float]]:
+    # Returns frames per pattern and pixel count, plus each pattern's best of `repeats`
+    # timed runs at timed_pixel_count. Archived from the top level: run inside the
+    # subtree, git archive also filters by cwd.
+    prefix = _git("rev-parse", "--show-prefix").decode().strip()
+    top_level = _git("rev-parse", "--show-toplevel").decode().strip()
+    archive = _git("-C", top_level, "archive", "--format=tar", f"{revision}:{prefix}")
+    with tempfile.TemporaryDirectory() as directory:
+        with tarfile.open(fileobj=io.BytesIO(archive)) as tree:
+            tree.extractall(directory, filter="data")
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                _RENDER_SCRIPT,
+                json.dumps([names, pixel_counts, frames, seed, timed_pixel_count, repeats]),
+            ],
+            cwd=directory,
+            check=True,
+            capture_output=True,
+        )
+    output = json.loads(result.stdout)
+    rendered = {
+        name: {count: [bytes.fromhex(frame) for frame in hex_frames] for count, hex_frames in counts.items()}
+        for name, counts in output["frames"].items()
+    }
+    return rendered, output["seconds"]
+
+
+def record(path: Path, revision: str, frames: int, seed: int) -> None:
+    commit = _git("rev-parse", "--verify", f"{revision}^{{commit}}").decode().strip()
+    rendered, _ = render_revision(commit, sorted(registered_patterns()), frames, seed)
+    golden: dict[str, dict[str, dict[str, str]]] = {}
+    for name, counts in rendered.items():
+        golden[name] = {
+            count: {
+                "sha256": frame_digest(strip_frames),
+                "samples": base64.b64encode(b"".join(strip_frames[::SAMPLE_EVERY])).decode("ascii"),
+            }
+            for count, strip_frames in counts.items()
+        }
+
+    with gzip.open(path, "wt", encoding="utf-8") as output:
+        json.dump(
+            {"source": commit, "frames": frames, "sample_every": SAMPLE_EVERY, "seed": seed, "patterns": golden},
+            output,
+            sort_keys=True,
+        )
+    print(
+        f"Recorded {len(golden)} patterns x {len(PIXEL_COUNTS)} pixel counts x {frames} frames "
+        f"from {commit[:12]} to {path}"
+    )
+
+
+def _git(*args: str) -> bytes:
+    return subprocess.run(["git", *args], cwd=HARDWARE_DIR, check=True, capture_output=True).stdout
+
+
+def compare(path: Path, engine_names: list[str], tolerance: int, checked: set[str]) -> bool:
+    with gzip.open(path, "rt", encoding="utf-8") as golden_file:
+        golden = json.load(golden_file)
+    frames = golden["frames"]
+    sample_every = golden["sample_every"]
+    seed = golden["seed"]
+    print(f"References from {golden['source'][:12]}, {frames} frames, seed {seed}")
+
+    # The reference renderers are timed at run time in a checkout of the recorded source,
+    # so speedups are measured on this machine rather than wherever they were recorded.
+    largest = max(PIXEL_COUNTS)
+    _, reference_seconds = render_revision(
+        golden["source"],
+        sorted(golden["patterns"]),
+        frames,
+        seed,
+        pixel_counts=(),
+        timed_pixel_count=largest,
+        repeats=3,
+    )
+
+    print(
+        f"{'pattern':<11} {'engine':<18} {'ms/frame':>8} {'speedup':>8} {'exact':>5} "
+        f"{'max diff':>8} {'mean diff':>9} {'within':>7}  result"
+    )
+    passed = True
+    for name, counts in sorted(golden["patterns"].items()):
+        for engine_name in engine_names:
+            exact = True
+            max_diff = 0
+            total_diff = 0
+            within = 0
+            channels = 0
+            for count, reference in counts.items():
+                rendered, _ = render_frames(ENGINES[engine_name], name, int(count), frames, seed)
+                exact = exact and frame_digest(rendered) == reference["sha256"]
+                samples = base64.b64decode(reference["samples"])
+                for expected, actual in zip(samples, b"".join(rendered[::sample_every])):
+                    diff = abs(expected - actual)
+                    max_diff = max(max_diff, diff)
+                    total_diff += diff
+                    within += diff <= tolerance
+                channels += len(samples)
+
+            engine_seconds = time_engine(ENGINES[engine_name], name, largest, frames, seed)
+            # Hashes cover every frame; a nonzero tolerance can only be judged on the samples.
+            ok = exact if tolerance == 0 else max_diff <= tolerance
+            enforced = engine_name in checked and name not in UNCHECKED_PATTERNS
+            if enforced and not ok:
+                passed = False
+            if ok:
+                result = "ok"
+            elif name in UNCHECKED_PATTERNS:
+                result = "unchecked"
+            else:
+                result = "FAIL" if enforced else "drift"
+            speedup = reference_seconds[name] / engine_seconds if engine_seconds else 0.0
+            print(
+                f"{name:<11} {engine_name:<18} {engine_seconds * 1000 / frames:>8.3f} {speedup:>7.2f}x "
+                f"{'yes' if exact else 'no':>5} {max_diff:>8} {total_diff / max(1, channels):>9.3f} "
+                f"{within * 100 / max(1, channels):>6.1f}%  {result}"
+            )
+    return passed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Record and compare golden pattern frames.")
+    parser.add_argument("command", choices=("record", "compare"))
+    parser.add_argument("--golden", type=Path, default=GOLDEN_PATH)
+    parser.add_argument(
+        "--revision",
+        default=BASELINE_REVISION,
+        help="git revision whose renderers the references are recorded from",
+    )
+    parser.add_argument("--frames", type=int, default=FRAMES)
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--engine", choices=sorted(ENGINES), action="append", help="engines to compare (default: all)")
+    parser.add_argument("--tolerance", type=int, default=0, help="allowed per-channel difference")
+    parser.add_argument(
+        "--check",
+        choices=sorted(ENGINES),
+        action="append",
+        help="engines that must stay within tolerance (default: full)",
+    )
+    args = parser.parse_args()
+
+    if args.command == "record":
+        record(args.golden, args.revision, args.frames, args.seed)
+        return 0
+
+    engine_names = args.engine or list(ENGINES)
+    checked = set(args.check or ["full"])
+    if not compare(args.golden, engine_names, args.tolerance, checked):
+        print("FAIL: checked engines drifted from the golden frames")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+import argparse
+import random
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backlight import BacklightController  # noqa: E402
+from input_events import InputCoalescer  # noqa: E402
+from instrumentation import INSTRUMENTS  # noqa: E402
+from state import RuntimeState  # noqa: E402
+
+# Hammers the input path with PIR edges and touches from several threads, the way
+# gpiozero and evdev callbacks arrive, and checks that callers never block, that the
+# backlight is only written on real on/off changes, and that the display settles off.
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Storm the motion/touch input path with synthetic events.")
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--events", type=int, default=20000, help="events per thread")
+    parser.add_argument("--off-delay", type=float, default=0.2)
+    parser.add_argument("--max-call-ms", type=float, default=1.0, help="fail when p99 callback time exceeds this")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        brightness_file = Path(directory) / "brightness"
+        backlight = BacklightController(brightness_file, max_brightness=255)
+        state = RuntimeState(initial_background_id="default")
+        wakes = []
+        inputs = InputCoalescer(
+            backlight=backlight,
+            state=state,
+            off_delay_seconds=args.off_delay,
+            on_wake=lambda: wakes.append(time.monotonic()),
+        )
+        inputs.start(display_on=False, motion_active=False)
+
+        call_seconds: list[float] = []
+        call_lock = threading.Lock()
+
+        def storm(seed: int) -> None:
+            rng = random.Random(seed)
+            sources = (inputs.motion, inputs.no_motion, inputs.touch)
+            durations = []
+            for _ in range(args.events):
+                source = rng.choice(sources)
+                started_at = time.perf_counter()
+                source()
+                durations.append(time.perf_counter() - started_at)
+            with call_lock:
+                call_seconds.extend(durations)
+
+        started_at = time.perf_counter()
+        threads = [threading.Thread(target=storm, args=(seed,)) for seed in range(args.threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        storm_seconds = time.perf_counter() - started_at
+
+        # End on a no-motion edge so the off timer has to fire once the storm is absorbed.
+        inputs.no_motion()
+        time.sleep(args.off_delay * 3 + 0.2)
+        settled_off = not state.snapshot.display_active and brightness_file.read_text().strip() == "0"
+        inputs.close()
+
+    total = args.threads * args.events + 1
+    transitions = INSTRUMENTS.counters["display_transitions"]
+    writes = INSTRUMENTS.counters["backlight_writes"]
+    # The max includes GIL handoffs between storm threads, so judge blocking on p99.
+    call_seconds.sort()
+    p99_ms = call_seconds[int(len(call_seconds) * 0.99)] * 1000.0
+    slowest_ms = call_seconds[-1] * 1000.0
+    print(f"{total} events from {args.threads} threads in {storm_seconds * 1000:.0f}ms")
+    print(f"  processed          {INSTRUMENTS.counters['input_events']}")
+    print(f"  display changes    {transitions} ({len(wakes)} wakes)")
+    print(f"  backlight writes   {writes}")
+    print(f"  callback p99       {p99_ms:.3f}ms (max {slowest_ms:.3f}ms)")
+    print(f"  settled off        {settled_off}")
+
+    failures = []
+    if writes > transitions:
+        failures.append("backlight written without a display change")
+    if p99_ms > args.max_call_ms:
+        failures.append("input callback blocked")
+    if INSTRUMENTS.counters["input_events"] != total:
+        failures.append("events lost")
+    if not settled_off:
+        failures.append("display did not turn off after the storm")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("OK")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+import argparse
+import random
+import socket
+import struct
+import sys
+from dataclasses import replace
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import NEOPIXEL  # noqa: E402
+from network_pixels import DdpPixels, E131Pixels  # noqa: E402
+
+# Sends frames through the DDP and E1.31 drivers to a UDP socket on loopback, parses
+# every packet the way a receiver would and rebuilds the strip from them. Checks
+# offsets and lengths, the DDP PUSH flag and per-frame sequence, the E1.31 universe
+# split and per-universe sequence, and that the rebuilt strip matches each sent frame.
+# Skip-unchanged stays on, so repeated and partly changed frames are covered too.
+
+_DDP_HEADER = struct.Struct(">BBBBLH")
+_E131_HEADER_SIZE = 126
+_E131_BYTES_PER_UNIVERSE = 170 * 3
+
+
+def _frames(pixel_count: int, count: int, rng: random.Random) -> list[bytes]:
+    frames: list[bytes] = []
+    for index in range(count):
+        if index % 4 == 1:
+            # Unchanged: only the keepalive may resend anything.
+            frames.append(frames[-1])
+        elif index % 4 == 2:
+            # One pixel in the middle changes, so only its chunk goes out.
+            frame = bytearray(frames[-1])
+            middle = (pixel_count // 2) * 3
+            frame[middle : middle + 3] = rng.randbytes(3)
+            frames.append(bytes(frame))
+        else:
+            frames.append(rng.randbytes(pixel_count * 3))
+    return frames
+
+
+def _receive(receiver: socket.socket) -> list[bytes]:
+    packets: list[bytes] = []
+    while True:
+        try:
+            packets.append(receiver.recv(65535))
+        except socket.timeout:
+            return packets
+
+
+def check_ddp(receiver: socket.socket, port: int, frames: list[bytes], pixel_count: int) -> list[str]:
+    config = replace(NEOPIXEL, backend="ddp", count=pixel_count, net_host="127.0.0.1", net_port=port)
+    pixels = DdpPixels(config)
+    strip = bytearray(pixel_count * 3)
+    errors: list[str] = []
+    packet_total = 0
+
+    for index, frame in enumerate(frames):
+        pixels.show(frame)
+        packets = _receive(receiver)
+        packet_total += len(packets)
+        expected_sequence = index % 15 + 1
+        for number, packet in enumerate(packets):
+            flags, sequence, data_type, destination, offset, length = _DDP_HEADER.unpack_from(packet)
+            data = packet[_DDP_HEADER.size :]
+            is_last = number == len(packets) - 1
+            if flags & 0xC0 != 0x40:
+                errors.append(f"ddp frame {index}: version bits {flags:#04x}")
+            if bool(flags & 0x01) != is_last:
+                errors.append(f"ddp frame {index}: PUSH {'missing on' if is_last else 'set on'} packet {number}")
+            if sequence != expected_sequence:
+                errors.append(f"ddp frame {index}: sequence {sequence}, expected {expected_sequence}")
+            if data_type != 0x0B or destination != 0x01:
+                errors.append(f"ddp frame {index}: type {data_type:#04x} destination {destination:#04x}")
+            if length != len(data) or offset + length > len(strip):
+                errors.append(f"ddp frame {index}: offset {offset} length {length} with {len(data)} data bytes")
+                continue
+            strip[offset : offset + length] = data
+        if strip != frame:
+            errors.append(f"ddp frame {index}: rebuilt strip differs from the sent frame")
+
+    print(f"ddp:   {len(frames)} frames, {packet_total} packets, {len(errors)} problems")
+    return errors
+
+
+def check_e131(receiver: socket.socket, port: int, frames: list[bytes], pixel_count: int) -> list[str]:
+    config = replace(NEOPIXEL, backend="e131", count=pixel_count, net_host="127.0.0.1", net_port=port)
+    pixels = E131Pixels(config)
+    universes = -(-pixel_count * 3 // _E131_BYTES_PER_UNIVERSE)
+    last_sequence = {config.net_universe + index: 0 for index in range(universes)}
+    strip = bytearray(pixel_count * 3)
+    errors: list[str] = []
+    packet_total = 0
+
+    for index, frame in enumerate(frames):
+        pixels.show(frame)
+        packets = _receive(receiver)
+        packet_total += len(packets)
+        for packet in packets:
+            length = len(packet)
+            universe = struct.unpack_from(">H", packet, 113)[0]
+            sequence = packet[111]
+            property_count = struct.unpack_from(">H", packet, 123)[0]
+            data = packet[_E131_HEADER_SIZE:]
+            if packet[4:16] != b"ASC-E1.17\x00\x00\x00":
+                errors.append(f"e131 frame {index}: bad ACN packet identifier")
+            for layer, vector_offset, vector_format, vector in ((16, 18, ">L", 4), (38, 40, ">L", 2), (115, 117, ">B", 2)):
+                flags_length = struct.unpack_from(">H", packet, layer)[0]
+                if flags_length != 0x7000 | (length - layer):
+                    errors.append(f"e131 frame {index}: layer at {layer} has length {flags_length & 0x0FFF}")
+                if struct.unpack_from(vector_format, packet, vector_offset)[0] != vector:
+                    errors.append(f"e131 frame {index}: layer at {layer} has the wrong vector")
+            if universe not in last_sequence:
+                errors.append(f"e131 frame {index}: unexpected universe {universe}")
+                continue
+            if sequence != (last_sequence[universe] + 1) & 0xFF:
+                errors.append(f"e131 frame {index}: universe {universe} sequence {sequence} after {last_sequence[universe]}")
+            last_sequence[universe] = sequence
+            if property_count != len(data) + 1 or packet[125] != 0:
+                errors.append(f"e131 frame {index}: universe {universe} property count {property_count}")
+            offset = (universe - config.net_universe) * _E131_BYTES_PER_UNIVERSE
+            expected_length = min(_E131_BYTES_PER_UNIVERSE, len(strip) - offset)
+            if len(data) != expected_length:
+                errors.append(f"e131 frame {index}: universe {universe} carries {len(data)} bytes, expected {expected_length}")
+                continue
+            strip[offset : offset + len(data)] = data
+        if strip != frame:
+            errors.append(f"e131 frame {index}: rebuilt strip differs from the sent frame")
+
+    print(f"e131:  {len(frames)} frames, {packet_total} packets over {universes} universes, {len(errors)} problems")
+    return errors
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Reassemble DDP and E1.31 output on loopback and compare frames.")
+    parser.add_argument("--pixels", type=int, default=1000)
+    parser.add_argument("--frames", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+    receiver.bind(("127.0.0.1", 0))
+    receiver.settimeout(0.05)
+    port = receiver.getsockname()[1]
+
+    frames = _frames(args.pixels, args.frames, random.Random(args.seed))
+    errors = check_ddp(receiver, port, frames, args.pixels) + check_e131(receiver, port, frames, args.pixels)
+    receiver.close()
+
+    for error in errors[:20]:
+        print(f"  {error}")
+    if errors:
+        print(f"FAIL: {len(errors)} problems")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
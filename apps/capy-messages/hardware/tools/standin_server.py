@@ -0,0 +1,175 @@
+import json
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from zoneinfo import ZoneInfo
+
+# Stand-in for the Next.js /api/message and /api/message/stream routes, so the sync
+# client can be exercised without the web app. Payloads mirror lib/message-store.ts.
+
+STATE_TICK_SECONDS = 5.0
+
+
+@dataclass
+class StreamFaults:
+    # Split each event into writes of this many bytes (0 = one write), sleeping between them.
+    chunk_bytes: int = 0
+    chunk_delay_seconds: float = 0.0
+    # Close the stream after this many events on a connection (0 = never).
+    drop_every_events: int = 0
+
+
+class StandInMessageServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        self._condition = threading.Condition()
+        self._version = 0
+        self._state: dict[str, object] = {
+            "activeMessage": "Hello",
+            "activeBackgroundId": "default",
+            "updatedAt": _timestamp(),
+            "scheduledMessages": [],
+        }
+        self._closed = False
+        self.faults = StreamFaults()
+        self.emitted_background_ids: list[str] = []
+        self.stream_connected_at: list[float] = []
+        self.stream_dropped_at: list[float] = []
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="standin-http", daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._server.shutdown()
+        self._server.server_close()
+
+    def set_background(self, background_id: str) -> None:
+        self.update(activeBackgroundId=background_id, updatedAt=_timestamp())
+
+    def update(self, **changes: object) -> None:
+        with self._condition:
+            self._state = {**self._state, **changes}
+            self._version += 1
+            self._condition.notify_all()
+
+    def snapshot(self) -> tuple[int, dict[str, object]]:
+        with self._condition:
+            return self._version, self._state
+
+    def wait_for_change(self, version: int, timeout: float) -> tuple[int, dict[str, object]] | None:
+        with self._condition:
+            self._condition.wait_for(lambda: self._version != version or self._closed, timeout=timeout)
+            if self._closed:
+                return None
+            return self._version, self._state
+
+    def encode_state(self, state: dict[str, object]) -> bytes:
+        return json.dumps(state, separators=(",", ":")).encode("utf-8")
+
+    def write_event(self, handler: BaseHTTPRequestHandler, state: dict[str, object]) -> None:
+        event = b"data: " + self.encode_state(state) + b"\n\n"
+        faults = self.faults
+        if faults.chunk_bytes > 0:
+            for start in range(0, len(event), faults.chunk_bytes):
+                handler.wfile.write(event[start : start + faults.chunk_bytes])
+                handler.wfile.flush()
+                if faults.chunk_delay_seconds:
+                    time.sleep(faults.chunk_delay_seconds)
+        else:
+            handler.wfile.write(event)
+            handler.wfile.flush()
+        self.emitted_background_ids.append(str(state.get("activeBackgroundId")))
+
+    def stream(self, handler: BaseHTTPRequestHandler) -> None:
+        self.stream_connected_at.append(time.monotonic())
+        version, state = self.snapshot()
+        self.write_event(handler, state)
+        sent = 1
+        while True:
+            if self.faults.drop_every_events and sent >= self.faults.drop_every_events:
+                self.stream_dropped_at.append(time.monotonic())
+                return
+            changed = self.wait_for_change(version, STATE_TICK_SECONDS)
+            if changed is None:
+                return
+            version, state = changed
+            self.write_event(handler, state)
+            sent += 1
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                path = self.path.split("?", 1)[0]
+                if path == "/api/message":
+                    body = server.encode_state(server.snapshot()[1])
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                    return
+
+                if path == "/api/message/stream":
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+                    self.send_header("Cache-Control", "no-cache, no-transform")
+                    self.end_headers()
+                    try:
+                        server.stream(self)
+                    except (BrokenPipeError, ConnectionResetError):
+                        return
+                    return
+
+                self.send_error(404)
+
+            def do_PUT(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    body = json.loads(self.rfile.read(length) or b"{}")
+                except json.JSONDecodeError:
+                    self.send_error(400)
+                    return
+                if isinstance(body.get("backgroundId"), str):
+                    server.set_background(body["backgroundId"])
+                self.send_response(204)
+                self.end_headers()
+
+            def log_message(self, format: str, *args: object) -> None:
+                return
+
+        return Handler
+
+
+def _timestamp() -> str:
+    # Matches pacificTimestampNoTimezone() in lib/message-store.ts.
+    return datetime.now(ZoneInfo("America/Los_Angeles")).strftime("%Y-%m-%dT%H:%M:%S")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve a stand-in message API for the hardware daemon.")
+    parser.add_argument("--port", type=int, default=3000)
+    args = parser.parse_args()
+
+    standin = StandInMessageServer(port=args.port)
+    print(f"Stand-in message API on {standin.base_url} (PUT /api/message with {{\"backgroundId\": ...}})")
+    standin.start()
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        standin.close()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+HARDWARE_DIR = Path(__file__).resolve().parent.parent
+
+# Each run is a fresh interpreter, so module caches and imports are measured the way a
+# systemd restart sees them. The child runs the real main() and stops it as soon as
+# show_first_frame() returns, before the GPIO and HTTP stacks are imported.
+_CHILD = """
+import json, sys, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+
+
+class FirstFrameShown(Exception):
+    pass
+
+
+show_first_frame = main.show_first_frame
+
+
+def timed_show_first_frame(*args):
+    show_first_frame(*args)
+    raise FirstFrameShown(time.perf_counter())
+
+
+main.show_first_frame = timed_show_first_frame
+try:
+    main.main()
+except FirstFrameShown as shown:
+    first_frame = shown.args[0]
+else:
+    sys.exit("main() returned without showing a cached first frame")
+
+deferred = {}
+for module in ("requests", "gpiozero", "lgpio", "evdev"):
+    before = time.perf_counter()
+    try:
+        __import__(module)
+    except ImportError:
+        continue
+    deferred[module] = time.perf_counter() - before
+
+print(json.dumps({
+    "wall_first_frame": time.time(),
+    "import_main": imported - started,
+    "first_frame": first_frame - started,
+    "deferred": deferred,
+}))
+"""
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure daemon import and time-to-first-frame.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--pixels", type=int, default=300)
+    parser.add_argument("--backend", default="off", help="NEOPIXEL_BACKEND for the run (default: off)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache_path = Path(directory) / "state.json"
+        cache_path.write_text(json.dumps({"backgroundId": "beach", "displayActive": True}))
+        backlight_dir = Path(directory) / "backlight"
+        backlight_dir.mkdir()
+        (backlight_dir / "max_brightness").write_text("255\n")
+        env = {
+            **os.environ,
+            "PYTHONPATH": str(HARDWARE_DIR),
+            "NEOPIXEL_BACKEND": args.backend,
+            "NEOPIXEL_COUNT": str(args.pixels),
+            "STATE_CACHE_PATH": str(cache_path),
+            "BACKLIGHT_DIR": str(backlight_dir),
+        }
+
+        results = []
+        for _ in range(args.runs):
+            launched_at = time.time()
+            output = subprocess.run(
+                [sys.executable, "-c", _CHILD],
+                cwd=HARDWARE_DIR,
+                env=env,
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            result["process_first_frame"] = result["wall_first_frame"] - launched_at
+            results.append(result)
+
+    def median_ms(key: str) -> float:
+        return statistics.median(result[key] for result in results) * 1000.0
+
+    print(f"Startup over {args.runs} runs ({args.pixels} pixels, backend={args.backend}):")
+    print(f"  import main           {median_ms('import_main'):8.1f}ms")
+    print(f"  first frame (in-proc) {median_ms('first_frame'):8.1f}ms")
+    print(f"  launch to first frame {median_ms('process_first_frame'):8.1f}ms")
+    deferred = results[-1]["deferred"]
+    if deferred:
+        print("  deferred until after the first frame:")
+        for module, seconds in deferred.items():
+            print(f"    {module:<18} {seconds * 1000:8.1f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
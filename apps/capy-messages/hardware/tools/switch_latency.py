@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import queue
+import sys
+import threading
+import time
+from dataclasses import replace
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from standin_server import StandInMessageServer  # noqa: E402
+
+# Measures how long a background change takes from the server write until the first
+# frame rendering it is pushed, through the real sync client, state and renderer.
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure end-to-end background switch latency.")
+    parser.add_argument("--switches", type=int, default=40)
+    parser.add_argument("--pixels", type=int, default=300)
+    parser.add_argument("--interval", type=float, default=0.25, help="seconds between switches")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=float(os.getenv("SWITCH_LATENCY_BUDGET_MS", "250")),
+        help="fail when p99 switch latency exceeds this",
+    )
+    args = parser.parse_args()
+
+    server = StandInMessageServer()
+    server.start()
+    os.environ["MESSAGE_API_BASE_URL"] = server.base_url
+
+    from background_sync import BackgroundSyncClient
+    from backgrounds import BACKGROUND_LIGHTING, DEFAULT_BACKGROUND_ID
+    from config import ANIMATION_FRAME_DELAY_SECONDS
+    from instrumentation import INSTRUMENTS
+    from patterns import PatternRenderer
+    from state import RuntimeState
+
+    state = RuntimeState(initial_background_id=DEFAULT_BACKGROUND_ID)
+    state.set_display_active(True)
+    renderer = PatternRenderer(pixel_count=args.pixels)
+    shown: queue.Queue[tuple[str, float]] = queue.Queue()
+
+    def animation_loop() -> None:
+        frame = 0
+        version = -1
+        applied = None
+        while not state.shutdown.is_set():
+            snapshot = state.snapshot
+            if snapshot.version != version:
+                version = snapshot.version
+                renderer.select(snapshot.background_id)
+            selected_at = time.monotonic()
+            renderer.render(frame)
+            frame += 1
+            if snapshot.background_id != applied:
+                applied = snapshot.background_id
+                shown_at = time.monotonic()
+                shown.put((applied, shown_at))
+                if snapshot.background_timing is not None:
+                    INSTRUMENTS.record_switch(
+                        replace(snapshot.background_timing, selected_at=selected_at, shown_at=shown_at),
+                        applied,
+                    )
+            time.sleep(ANIMATION_FRAME_DELAY_SECONDS)
+
+    client = BackgroundSyncClient(
+        on_background_id=state.set_background_id,
+        shutdown_event=state.shutdown,
+        display_active=state.display_active,
+    )
+    threading.Thread(target=animation_loop, daemon=True).start()
+    threading.Thread(target=client.run_forever, daemon=True).start()
+    time.sleep(0.5)
+
+    background_ids = [item.background_id for item in BACKGROUND_LIGHTING]
+    latencies_ms: list[float] = []
+    missed = 0
+    current = DEFAULT_BACKGROUND_ID
+    for index in range(args.switches):
+        target = background_ids[(background_ids.index(current) + 1) % len(background_ids)]
+        while not shown.empty():
+            shown.get_nowait()
+
+        written_at = time.monotonic()
+        server.set_background(target)
+        deadline = written_at + 5.0
+        while True:
+            try:
+                background_id, shown_at = shown.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                missed += 1
+                break
+            if background_id == target:
+                latencies_ms.append((shown_at - written_at) * 1000.0)
+                break
+        current = target
+        time.sleep(args.interval)
+
+    state.request_shutdown()
+    server.close()
+
+    if not latencies_ms:
+        print("No switches observed.")
+        return 1
+
+    p50 = percentile(latencies_ms, 0.50)
+    p99 = percentile(latencies_ms, 0.99)
+    print(
+        f"\nSwitch latency over {len(latencies_ms)} switches ({missed} missed): "
+        f"p50={p50:.1f}ms p99={p99:.1f}ms max={max(latencies_ms):.1f}ms budget={args.budget_ms:.0f}ms"
+    )
+    for stage in ("switch_read", "switch_parse", "switch_pickup", "switch_show", "sync_apply"):
+        histogram = INSTRUMENTS.histograms[stage]
+        if histogram.count:
+            print(f"  {stage:<14} mean={histogram.total_seconds / histogram.count * 1000:.2f}ms")
+
+    if missed or p99 > args.budget_ms:
+        print("FAIL: switch latency over budget" if p99 > args.budget_ms else "FAIL: missed switches")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
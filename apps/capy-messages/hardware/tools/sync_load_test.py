@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from standin_server import StandInMessageServer, StreamFaults  # noqa: E402
+
+# Runs BackgroundSyncClient in a forked child against the stand-in server under several
+# load scenarios, and reports client CPU per event, RSS growth, reconnect time and
+# updates the server emitted that the client never applied.
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    events: int
+    rate_hz: float
+    scheduled_messages: int = 0
+    faults: StreamFaults = field(default_factory=StreamFaults)
+
+
+@dataclass(frozen=True)
+class ClientReport:
+    applied: list[str]
+    cpu_seconds: float
+    rss_start_kb: int
+    rss_end_kb: int
+
+
+SCENARIOS = (
+    Scenario(name="steady", events=200, rate_hz=50.0),
+    Scenario(name="burst", events=2000, rate_hz=1000.0),
+    Scenario(name="large-payload", events=100, rate_hz=20.0, scheduled_messages=2000),
+    Scenario(
+        name="partial-writes",
+        events=100,
+        rate_hz=20.0,
+        scheduled_messages=50,
+        faults=StreamFaults(chunk_bytes=64, chunk_delay_seconds=0.001),
+    ),
+    Scenario(name="dropped-connections", events=100, rate_hz=20.0, faults=StreamFaults(drop_every_events=10)),
+)
+
+
+def _rss_kb() -> int:
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * (os.sysconf("SC_PAGE_SIZE") // 1024)
+
+
+def _run_client(stop, results) -> None:
+    from background_sync import BackgroundSyncClient
+
+    applied: list[str] = []
+    shutdown = threading.Event()
+    client = BackgroundSyncClient(
+        on_background_id=lambda background_id, timing: applied.append(background_id),
+        shutdown_event=shutdown,
+    )
+    thread = threading.Thread(target=client.run_forever, daemon=True)
+
+    rss_start = _rss_kb()
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    cpu_start = usage.ru_utime + usage.ru_stime
+    thread.start()
+    stop.wait()
+    shutdown.set()
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    results.send(
+        ClientReport(
+            applied=applied,
+            cpu_seconds=usage.ru_utime + usage.ru_stime - cpu_start,
+            rss_start_kb=rss_start,
+            rss_end_kb=_rss_kb(),
+        )
+    )
+
+
+def run_scenario(scenario: Scenario, server: StandInMessageServer, settle_seconds: float) -> dict[str, object]:
+    server.faults = scenario.faults
+    server.update(
+        activeBackgroundId=f"{scenario.name}-start",
+        scheduledMessages=[
+            {
+                "id": f"2099-01-01T00:{index // 60 % 60:02d}:{index % 60:02d}",
+                "message": "x" * 80,
+                "backgroundId": "beach",
+                "startAt": "2099-01-01T00:00:00",
+                "createdAt": "2099-01-01T00:00:00",
+            }
+            for index in range(scenario.scheduled_messages)
+        ],
+    )
+    server.emitted_background_ids.clear()
+    server.stream_connected_at.clear()
+    server.stream_dropped_at.clear()
+
+    context = multiprocessing.get_context("fork")
+    stop = context.Event()
+    parent_conn, child_conn = context.Pipe()
+    process = context.Process(target=_run_client, args=(stop, child_conn), daemon=True)
+    process.start()
+    time.sleep(0.5)
+
+    started_at = time.monotonic()
+    for index in range(scenario.events):
+        server.set_background(f"{scenario.name}-{index}")
+        next_at = started_at + (index + 1) / scenario.rate_hz
+        delay = next_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+    last_background_id = f"{scenario.name}-{scenario.events - 1}"
+    time.sleep(settle_seconds)
+
+    stop.set()
+    report: ClientReport = parent_conn.recv()
+    process.join(timeout=2.0)
+
+    applied = set(report.applied)
+    emitted = {background_id for background_id in server.emitted_background_ids if background_id.startswith(scenario.name)}
+    reconnects = [
+        min((connected for connected in server.stream_connected_at if connected > dropped), default=None)
+        for dropped in server.stream_dropped_at
+    ]
+    reconnect_seconds = [connected - dropped for connected, dropped in zip(reconnects, server.stream_dropped_at) if connected]
+
+    return {
+        "scenario": scenario.name,
+        "events": len(emitted),
+        "cpu_ms_per_event": report.cpu_seconds * 1000.0 / max(1, len(emitted)),
+        "rss_growth_kb": report.rss_end_kb - report.rss_start_kb,
+        "reconnects": len(reconnect_seconds),
+        "reconnect_ms": max(reconnect_seconds, default=0.0) * 1000.0,
+        "missed": len(emitted - applied),
+        "converged": bool(report.applied) and report.applied[-1] == last_background_id,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Load-test the background sync client against a stand-in server.")
+    parser.add_argument("--scenario", choices=[scenario.name for scenario in SCENARIOS], action="append")
+    parser.add_argument("--settle", type=float, default=3.0, help="seconds to wait after the last event")
+    args = parser.parse_args()
+
+    server = StandInMessageServer()
+    server.start()
+    os.environ["MESSAGE_API_BASE_URL"] = server.base_url
+
+    selected = [scenario for scenario in SCENARIOS if not args.scenario or scenario.name in args.scenario]
+    rows = [run_scenario(scenario, server, args.settle) for scenario in selected]
+    server.close()
+
+    print(
+        f"{'scenario':<20} {'events':>7} {'cpu/event':>10} {'rss+':>8} "
+        f"{'reconn':>6} {'reconn max':>10} {'missed':>6} {'converged':>9}"
+    )
+    for row in rows:
+        print(
+            f"{row['scenario']:<20} {row['events']:>7} {row['cpu_ms_per_event']:>8.3f}ms "
+            f"{row['rss_growth_kb']:>6}kB {row['reconnects']:>6} {row['reconnect_ms']:>8.0f}ms "
+            f"{row['missed']:>6} {str(row['converged']):>9}"
+        )
+    return 0 if all(row["converged"] for row in rows) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
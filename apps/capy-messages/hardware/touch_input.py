@@ -1,8 +1,18 @@
+import ctypes
+import os
+import select
 import threading
 import time
 from typing import Callable
 
 from config import TOUCH
+from tracing import TRACER
+
+_INPUT_DIRECTORY = b"/dev/input"
+# udev creates the event node, then fixes its permissions, then removes it on unplug.
+_IN_ATTRIB = 0x004
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
 
 
 class TouchWatcher:
@@ -10,6 +20,11 @@ class TouchWatcher:
         self._on_touch = on_touch
         self._shutdown = shutdown_event
         self._last_touch_at = 0.0
+        self._wake_read, self._wake_write = os.pipe()
+
+    def close(self) -> None:
+        # Wakes the select() below so shutdown does not wait for the next touch.
+        os.write(self._wake_write, b"\0")
 
     def run_forever(self) -> None:
         if not TOUCH.enabled:
@@ -22,30 +37,58 @@ class TouchWatcher:
             return
 
         devices: dict[str, InputDevice] = {}
-        next_rescan_at = 0.0
+        watch_fd = _watch_input_directory()
+        if watch_fd is None:
+            print("Touch watcher: inotify unavailable; polling for devices only while none is attached.")
+        rescan = True
 
         try:
             while not self._shutdown.is_set():
-                now = time.monotonic()
-
-                if now >= next_rescan_at:
-                    self._refresh_devices(devices, InputDevice, list_devices, ecodes)
-                    next_rescan_at = now + max(0.25, TOUCH.rescan_seconds)
+                if rescan:
+                    with TRACER.span("touch_rescan", "input"):
+                        self._refresh_devices(devices, InputDevice, list_devices, ecodes)
+                    rescan = False
+
+                # Block in the kernel until a device has input, a device node comes or
+                # goes, or close() is called; nothing wakes on a timer.
+                waitables = [*devices.values(), self._wake_read]
+                if watch_fd is not None:
+                    waitables.append(watch_fd)
+                timeout = None if devices or watch_fd is not None else max(0.25, TOUCH.rescan_seconds)
+
+                try:
+                    ready, _, _ = select.select(waitables, [], [], timeout)
+                except (OSError, ValueError):
+                    rescan = True
+                    continue
+
+                if not ready:
+                    rescan = True
+                    continue
+
+                for source in ready:
+                    if source == self._wake_read:
+                        continue
+                    if source == watch_fd:
+                        _drain(watch_fd)
+                        rescan = True
+                        continue
 
-                for path, device in list(devices.items()):
                     try:
-                        event = device.read_one()
-                        while event is not None:
-                            if self._is_touch_event(event, ecodes):
-                                self._emit_touch_if_due()
-                            event = device.read_one()
+                        with TRACER.span("touch_read", "input"):
+                            event = source.read_one()
+                            while event is not None:
+                                if self._is_touch_event(event, ecodes):
+                                    self._emit_touch_if_due()
+                                event = source.read_one()
                     except OSError:
-                        self._close_device(path, devices)
-
-                time.sleep(0.01)
+                        self._close_device(source.path, devices)
+                        rescan = True
         finally:
             for path in list(devices):
                 self._close_device(path, devices)
+            if watch_fd is not None:
+                os.close(watch_fd)
 
     def _emit_touch_if_due(self) -> None:
         now = time.monotonic()
@@ -133,3 +176,27 @@ class TouchWatcher:
             device.close()
         except Exception:
             return
+
+
+def _watch_input_directory() -> int | None:
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    except (AttributeError, OSError):
+        return None
+    if fd < 0:
+        return None
+
+    if libc.inotify_add_watch(fd, _INPUT_DIRECTORY, _IN_CREATE | _IN_DELETE | _IN_ATTRIB) < 0:
+        os.close(fd)
+        return None
+    return fd
+
+
+def _drain(fd: int) -> None:
+    # The events only say "something changed"; the rescan works out what.
+    try:
+        while os.read(fd, 4096):
+            pass
+    except BlockingIOError:
+        return
@@ -0,0 +1,122 @@
+import json
+import os
+import signal
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+from config import TRACING
+
+# (phase, name, category, start_us, duration_us, thread id)
+TraceEvent = tuple[str, str, str, float, float, int]
+
+
+class _Span:
+    __slots__ = ("_tracer", "_name", "_category", "_started_at")
+
+    def __init__(self, tracer: "Tracer", name: str, category: str) -> None:
+        self._tracer = tracer
+        self._name = name
+        self._category = category
+        self._started_at = 0.0
+
+    def __enter__(self) -> "_Span":
+        self._started_at = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._tracer.complete(self._name, self._category, self._started_at, time.perf_counter())
+
+
+class _NoopSpan:
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        return
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    def __init__(self, capacity: int, output_path: Path, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self._output_path = output_path
+        # A bounded deque keeps the newest events; appends are atomic, so no lock on the hot path.
+        self._events: deque[TraceEvent] = deque(maxlen=max(1, capacity))
+        self._thread_names: dict[int, str] = {}
+
+    def span(self, name: str, category: str) -> _Span | _NoopSpan:
+        if not self.enabled:
+            return _NOOP_SPAN
+        return _Span(self, name, category)
+
+    def complete(self, name: str, category: str, started_at: float, ended_at: float) -> None:
+        if not self.enabled:
+            return
+        thread_id = threading.get_ident()
+        if thread_id not in self._thread_names:
+            self._thread_names[thread_id] = threading.current_thread().name
+        self._events.append(
+            ("X", name, category, started_at * 1e6, (ended_at - started_at) * 1e6, thread_id)
+        )
+
+    def instant(self, name: str, category: str) -> None:
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        thread_id = threading.get_ident()
+        if thread_id not in self._thread_names:
+            self._thread_names[thread_id] = threading.current_thread().name
+        self._events.append(("i", name, category, now * 1e6, 0.0, thread_id))
+
+    def toggle(self) -> None:
+        if self.enabled:
+            # Stop first so a failed write still ends the recording window.
+            self.enabled = False
+            self.dump()
+            return
+        self._events.clear()
+        self.enabled = True
+        print("Tracing started.")
+
+    def dump(self, path: Path | None = None) -> Path | None:
+        path = path or self._output_path
+        pid = os.getpid()
+        trace_events: list[dict[str, object]] = [
+            {"ph": "M", "name": "thread_name", "pid": pid, "tid": thread_id, "args": {"name": name}}
+            for thread_id, name in list(self._thread_names.items())
+        ]
+        for phase, name, category, start_us, duration_us, thread_id in list(self._events):
+            event: dict[str, object] = {
+                "ph": phase,
+                "name": name,
+                "cat": category,
+                "ts": round(start_us, 1),
+                "pid": pid,
+                "tid": thread_id,
+            }
+            if phase == "X":
+                event["dur"] = round(duration_us, 1)
+            else:
+                event["s"] = "t"
+            trace_events.append(event)
+
+        try:
+            path.write_text(json.dumps({"traceEvents": trace_events, "displayTimeUnit": "ms"}))
+        except OSError as exc:
+            # Runs from the SIGUSR2 handler on the main thread, so it must never raise.
+            print(f"Trace write failed ({path}): {exc}")
+            return None
+        print(f"Trace with {len(trace_events)} events written to {path}")
+        return path
+
+
+TRACER = Tracer(capacity=TRACING.buffer_events, output_path=TRACING.output_path, enabled=TRACING.enabled)
+
+
+def install_trace_signal(tracer: Tracer = TRACER) -> None:
+    # SIGUSR2 starts a recording window, and the next SIGUSR2 writes it out.
+    signal.signal(signal.SIGUSR2, lambda signum, frame: tracer.toggle())